@@ -1,16 +1,28 @@
 from .base import ForceStopLoop, bot, database
 from .db_funcs import (
     add_admin,
-    add_broadcast_data_id,
     add_fs_chat,
+    add_indexed_messages,
+    add_link,
     add_user,
+    count_link_hit,
+    count_users,
     del_admin,
-    del_broadcast_data_id,
+    del_broadcast_job,
     del_fs_chat,
+    del_indexed_messages,
     del_user,
-    get_broadcast_data_ids,
+    del_users,
+    get_broadcast_jobs,
+    get_indexed_messages,
+    get_link,
+    get_links,
     get_users,
     initial_database,
+    iter_users,
+    load_known_users,
+    save_broadcast_job,
+    set_link_ranges,
     update_force_text_msg,
     update_generate_status,
     update_protect_content,
@@ -19,38 +31,58 @@ from .db_funcs import (
 from .decorators import authorized_users_only
 from .helpers import (
     admin_buttons,
+    broadcast_manager,
     helper_buttons,
     helper_handlers,
     join_buttons,
+    link_registry,
+    message_delivery,
     url_safe,
 )
-from .utils import config, logger
+from .utils import RateLimiter, TTLCache, config, logger
 
 __all__ = [
     "ForceStopLoop",
     "bot",
     "database",
     "add_admin",
-    "add_broadcast_data_id",
     "add_fs_chat",
+    "add_indexed_messages",
+    "add_link",
     "add_user",
+    "count_link_hit",
+    "count_users",
     "del_admin",
-    "del_broadcast_data_id",
+    "del_broadcast_job",
     "del_fs_chat",
+    "del_indexed_messages",
     "del_user",
-    "get_broadcast_data_ids",
+    "del_users",
+    "get_broadcast_jobs",
+    "get_indexed_messages",
+    "get_link",
+    "get_links",
     "get_users",
     "initial_database",
+    "iter_users",
+    "load_known_users",
+    "save_broadcast_job",
+    "set_link_ranges",
     "update_force_text_msg",
     "update_generate_status",
     "update_protect_content",
     "update_start_text_msg",
     "authorized_users_only",
     "admin_buttons",
+    "broadcast_manager",
     "helper_buttons",
     "helper_handlers",
     "join_buttons",
+    "link_registry",
+    "message_delivery",
     "url_safe",
+    "RateLimiter",
+    "TTLCache",
     "config",
     "logger",
 ]
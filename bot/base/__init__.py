@@ -1,5 +1,19 @@
+from .buffer import CountBuffer, WriteBuffer, link_hits, user_buffer
 from .client import bot
+from .database import database
 from .exception import ForceStopLoop
-from .mongo import database
+from .known import KnownUsers, known_users
+from .storage import Storage
 
-__all__ = ["bot", "ForceStopLoop", "database"]
+__all__ = [
+    "bot",
+    "ForceStopLoop",
+    "database",
+    "Storage",
+    "WriteBuffer",
+    "CountBuffer",
+    "user_buffer",
+    "link_hits",
+    "KnownUsers",
+    "known_users",
+]
@@ -0,0 +1,220 @@
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from bot.utils import config, logger
+
+from .database import database
+
+
+class WriteBuffer:
+    """
+    A write-behind buffer that collects keys and flushes them in batches.
+
+    Keys are flushed through `flush_func` once `max_size` keys are pending,
+    or `interval` seconds after the first pending key, whichever comes first.
+
+    Attributes:
+        name (str): The name used in log messages.
+        flush_func (Callable[[List[Any]], Awaitable[None]]): The batch writer.
+        interval (float): The maximum delay before pending keys are flushed.
+        max_size (int): The number of pending keys that triggers a flush.
+
+    Methods:
+        add(key: Any) -> None:
+            Queues a key for the next flush.
+
+        discard(key: Any) -> None:
+            Drops a key that has not been flushed yet.
+
+        flush() -> None:
+            Writes all pending keys at once.
+
+        close() -> None:
+            Cancels the pending timer and flushes the remaining keys.
+
+        close_all() -> None:
+            Closes every buffer, e.g. when the bot stops.
+    """
+
+    # Every buffer created, so none is left unflushed on shutdown
+    instances: List["WriteBuffer"] = []
+
+    def __init__(
+        self,
+        name: str,
+        flush_func: Callable[[List[Any]], Awaitable[None]],
+        interval: float,
+        max_size: int,
+    ) -> None:
+        """
+        Initializes the WriteBuffer with an empty set of pending keys.
+
+        Args:
+            name (str): The name used in log messages.
+            flush_func (Callable[[List[Any]], Awaitable[None]]): The batch writer.
+            interval (float): The maximum delay before pending keys are flushed.
+            max_size (int): The number of pending keys that triggers a flush.
+        """
+        self.name = name
+        self.flush_func = flush_func
+        self.interval = interval
+        self.max_size = max_size
+        self._pending: Set[Any] = set()
+        # Created on first flush, so it binds to the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        WriteBuffer.instances.append(self)
+
+    def add(self, key: Any) -> None:
+        """
+        Queues a key for the next flush.
+
+        Args:
+            key (Any): The key to write.
+        """
+        self._pending.add(key)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """Starts a flush if the buffer is full, or the timer if it is not running."""
+        if len(self._pending) >= self.max_size:
+            task = asyncio.create_task(self.flush())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self._start_timer()
+
+    def _start_timer(self) -> None:
+        """Starts the flush timer if it is not running."""
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._delayed_flush())
+
+    def discard(self, key: Any) -> None:
+        """
+        Drops a key that has not been flushed yet.
+
+        Args:
+            key (Any): The key to drop.
+        """
+        self._pending.discard(key)
+
+    def _take(self) -> Any:
+        """Empties the buffer and returns the pending keys."""
+        keys, self._pending = list(self._pending), set()
+        return keys
+
+    async def _delayed_flush(self) -> None:
+        """Flushes the pending keys once the interval has elapsed."""
+        await asyncio.sleep(self.interval)
+        # The keys are taken once flushing starts, so close() must not cancel it
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Writes all pending keys at once. Keys are queued again and retried
+        after the interval if the write fails.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self._pending:
+                return
+
+            keys = self._take()
+            try:
+                await self.flush_func(keys)
+            except Exception as exc:
+                logger.error(f"{self.name}: {exc}")
+                self._pending.update(keys)
+                self._start_timer()
+
+    async def close(self) -> None:
+        """Cancels the pending timer and flushes the remaining keys."""
+        # Only a sleeping timer is referenced, a flushing one holds the lock
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+            self._timer = None
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        await self.flush()
+        logger.info(f"{self.name}: Flushed")
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Closes every buffer, e.g. when the bot stops."""
+        for buffer in cls.instances:
+            await buffer.close()
+
+
+class CountBuffer(WriteBuffer):
+    """
+    A write-behind buffer that sums counts per key and flushes them in batches.
+
+    `max_size` is the number of distinct pending keys, so a key counted
+    many times between flushes is written once with its total. `flush_func`
+    receives the totals as a dict of key to count.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush_func: Callable[[Dict[Any, int]], Awaitable[None]],
+        interval: float,
+        max_size: int,
+    ) -> None:
+        """
+        Initializes the CountBuffer with no pending counts.
+
+        Args:
+            name (str): The name used in log messages.
+            flush_func (Callable[[Dict[Any, int]], Awaitable[None]]): The batch writer.
+            interval (float): The maximum delay before pending counts are flushed.
+            max_size (int): The number of pending keys that triggers a flush.
+        """
+        super().__init__(name, flush_func, interval, max_size)
+        self._pending: Counter = Counter()
+
+    def add(self, key: Any) -> None:
+        """
+        Counts a key once for the next flush.
+
+        Args:
+            key (Any): The key to count.
+        """
+        self._pending[key] += 1
+        self._schedule()
+
+    def discard(self, key: Any) -> None:
+        """
+        Drops the pending count of a key.
+
+        Args:
+            key (Any): The key to drop.
+        """
+        self._pending.pop(key, None)
+
+    def _take(self) -> Dict[Any, int]:
+        """Empties the buffer and returns the pending counts."""
+        counts, self._pending = dict(self._pending), Counter()
+        return counts
+
+
+user_buffer: WriteBuffer = WriteBuffer(
+    name="UserBuffer",
+    flush_func=database.add_users,
+    interval=config.USER_FLUSH_INTERVAL / 1000,
+    max_size=config.USER_FLUSH_SIZE,
+)
+
+link_hits: CountBuffer = CountBuffer(
+    name="LinkHits",
+    flush_func=database.add_link_hits,
+    interval=config.LINK_FLUSH_INTERVAL / 1000,
+    max_size=config.LINK_FLUSH_SIZE,
+)
@@ -1,13 +1,14 @@
 import asyncio
 
-from hydrogram import Client, errors
+from hydrogram import Client, errors, raw
 from hydrogram.enums import ParseMode
 from hydrogram.types import BotCommand, BotCommandScopeAllPrivateChats
 
 from bot.utils import BOT_ID, config, logger
 
+from .buffer import WriteBuffer
+from .database import database
 from .exception import ForceStopLoop
-from .mongo import database
 
 # Attempt to use uvloop for the event loop if available
 try:
@@ -25,10 +26,13 @@ class Bot(Client):
 
     Methods:
         start() -> None:
-            Starts the bot and connects to MongoDB.
+            Logs the bot in without handling updates yet.
+
+        serve() -> None:
+            Starts handling updates once the settings are loaded.
 
         stop() -> None:
-            Stops the bot and closes the MongoDB connection.
+            Stops the bot, flushes buffered writes and closes the database connection.
 
         bot_commands_setup() -> None:
             Sets up bot commands for users.
@@ -49,42 +53,63 @@ class Bot(Client):
 
     async def start(self) -> None:
         """
-        Starts the bot, connecting to MongoDB and setting up commands.
-        """
-        logger.info("MongoDB: Connecting...")
-        await database.connect()
+        Connects and logs the bot in. Updates received from now on are
+        queued and only handled after `serve`, so the settings can be
+        loaded first.
 
+        Commands are set up separately through `bot_commands_setup`, so
+        registering them does not delay startup.
+        """
         logger.info("Bot: Starting...")
         try:
-            await super().start()
-            logger.info("Bot: Started")
+            is_authorized = await self.connect()
+            try:
+                if not is_authorized:
+                    await self.authorize()
+                await self.invoke(raw.functions.updates.GetState())
+                self.me = await self.get_me()
+            except BaseException:
+                await self.disconnect()
+                raise
         except errors.RPCError as rpc:
             raise ForceStopLoop(str(rpc.MESSAGE))
 
-        await self.bot_commands_setup()
         self.set_parse_mode(ParseMode.HTML)
 
+    async def serve(self) -> None:
+        """
+        Loads the plugins and starts handling the queued and new updates.
+        """
+        await self.initialize()
+        logger.info("Bot: Started")
+
     async def stop(self) -> None:
         """
-        Stops the bot, closes the HTTP session and MongoDB connection.
+        Stops the bot, flushes every write buffer (new users, dead users and
+        link hits), closes the HTTP session and database connection.
         """
         logger.info("Bot: Stopping...")
         try:
-            await super().stop()
+            if self.is_initialized:
+                await super().stop()
+            elif self.is_connected:
+                await self.disconnect()
         except Exception as exc:
             logger.error(str(exc))
         else:
             logger.info("Bot: Stopped")
 
-        logger.info("MongoDB: Closing...")
+        await WriteBuffer.close_all()
+
+        logger.info(f"{database.name}: Closing...")
         await database.close()
 
     async def bot_commands_setup(self) -> None:
         """
         Sets up the bot commands for user interaction.
         """
-        await self.delete_bot_commands()
         try:
+            await self.delete_bot_commands()
             await self.set_bot_commands(
                 commands=[
                     BotCommand("start", "Start Bot"),
@@ -94,8 +119,8 @@ class Bot(Client):
                 ],
                 scope=BotCommandScopeAllPrivateChats(),
             )
-        except errors.RPCError:
-            pass
+        except errors.RPCError as rpc:
+            logger.warning(f"Bot Commands: {rpc.MESSAGE}")
 
 
 # Instantiate the bot
@@ -0,0 +1,26 @@
+from bot.utils import config
+
+from .storage import Storage
+
+
+def get_database() -> Storage:
+    """
+    Creates the storage backend selected by `DATABASE_BACKEND`.
+
+    Backends are imported lazily so a deployment only needs the driver
+    of the backend it actually uses.
+
+    Returns:
+        Storage: The configured storage backend.
+    """
+    if config.DATABASE_BACKEND == "sqlite":
+        from .sqlite import SQLiteDatabase
+
+        return SQLiteDatabase(config.SQLITE_PATH)
+
+    from .mongo import MongoDatabase
+
+    return MongoDatabase(config.MONGODB_URL)
+
+
+database: Storage = get_database()
@@ -0,0 +1,167 @@
+from array import array
+from bisect import bisect_left
+from itertools import chain, filterfalse
+from typing import AsyncIterator, Iterable, List, Set
+
+
+class KnownUsers:
+    """
+    A compact in-memory set of user IDs that already exist in the database.
+
+    IDs live in a few sorted `array('q')` chunks (8 bytes per user). Newly
+    seen IDs go to a small set that becomes a new chunk once it grows past
+    `merge_size`. A chunk is only merged with the chunk before it when that
+    one is at most twice its size, so a merge costs about as much as the
+    IDs added since the last merge of that size, never the whole set.
+    Forgotten IDs are tombstoned and the chunks are compacted once the
+    tombstones outgrow a sixteenth of the known IDs.
+
+    Attributes:
+        ready (bool): Whether the IDs have been loaded from the database.
+        merge_size (int): The number of recent IDs that triggers a new chunk.
+
+    Methods:
+        load(user_ids: AsyncIterator[int]) -> int:
+            Replaces the known IDs with the IDs from the database.
+
+        add(user_id: int) -> None:
+            Marks a user ID as known.
+
+        discard(user_id: int) -> None:
+            Forgets a user ID.
+
+        discard_many(user_ids: Iterable[int]) -> None:
+            Forgets many user IDs.
+    """
+
+    def __init__(self, merge_size: int = 4096) -> None:
+        """
+        Initializes the KnownUsers instance with no known IDs.
+
+        Args:
+            merge_size (int): The number of recent IDs that triggers a new chunk.
+        """
+        self.ready: bool = False
+        self.merge_size = merge_size
+        self._chunks: List[array] = []
+        self._recent: Set[int] = set()
+        # IDs still stored in a chunk that are no longer known
+        self._removed: Set[int] = set()
+
+    def __contains__(self, user_id: int) -> bool:
+        """
+        Checks whether a user ID is known.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            bool: True if the user is known to exist in the database.
+        """
+        if user_id in self._recent:
+            return True
+
+        return user_id not in self._removed and self._in_chunks(user_id)
+
+    def __len__(self) -> int:
+        """Returns the number of known user IDs."""
+        stored = sum(len(chunk) for chunk in self._chunks)
+        return stored - len(self._removed) + len(self._recent)
+
+    async def load(self, user_ids: AsyncIterator[int]) -> int:
+        """
+        Replaces the known IDs with the IDs from the database.
+
+        Args:
+            user_ids (AsyncIterator[int]): User IDs in ascending order.
+
+        Returns:
+            int: The number of known user IDs.
+        """
+        loaded = array("q")
+        async for user_id in user_ids:
+            loaded.append(user_id)
+
+        # IDs seen while loading are kept in the recent set
+        self._chunks = [loaded]
+        self._removed.clear()
+        self._recent = {
+            user_id for user_id in self._recent if not self._in_chunks(user_id)
+        }
+        self.ready = True
+        return len(self)
+
+    def add(self, user_id: int) -> None:
+        """
+        Marks a user ID as known.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        if user_id in self._removed:
+            # Still stored in its chunk, lifting the tombstone is enough
+            self._removed.discard(user_id)
+            return
+
+        if self._in_chunks(user_id):
+            return
+
+        self._recent.add(user_id)
+        if self.ready and len(self._recent) >= self.merge_size:
+            self._merge()
+
+    def discard(self, user_id: int) -> None:
+        """
+        Forgets a user ID, so it is written again the next time it is seen.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        self.discard_many([user_id])
+
+    def discard_many(self, user_ids: Iterable[int]) -> None:
+        """
+        Forgets many user IDs, compacting the chunks at most once.
+
+        Args:
+            user_ids (Iterable[int]): The IDs of the users.
+        """
+        for user_id in user_ids:
+            self._recent.discard(user_id)
+            if self._in_chunks(user_id):
+                self._removed.add(user_id)
+
+        if len(self._removed) > max(self.merge_size, len(self) // 16):
+            self._compact()
+
+    def _in_chunks(self, user_id: int) -> bool:
+        """Checks whether a user ID is stored in one of the sorted chunks."""
+        for chunk in self._chunks:
+            index = bisect_left(chunk, user_id)
+            if index < len(chunk) and chunk[index] == user_id:
+                return True
+
+        return False
+
+    def _merge(self) -> None:
+        """Turns the recent IDs into a chunk and merges chunks of similar size."""
+        self._chunks.append(array("q", sorted(self._recent)))
+        self._recent.clear()
+
+        while len(self._chunks) > 1 and len(self._chunks[-2]) <= 2 * len(
+            self._chunks[-1]
+        ):
+            newer, older = self._chunks.pop(), self._chunks.pop()
+            # Sorting two sorted runs is a linear merge in C
+            self._chunks.append(array("q", sorted(chain(older, newer))))
+
+    def _compact(self) -> None:
+        """Drops the tombstoned IDs from every chunk."""
+        self._chunks = [
+            array("q", filterfalse(self._removed.__contains__, chunk))
+            for chunk in self._chunks
+        ]
+        self._removed.clear()
+
+
+known_users: KnownUsers = KnownUsers()
@@ -1,57 +1,56 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from async_pymongo import AsyncClient
+from pymongo import InsertOne, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from bot.utils import config, logger
+from bot.utils import logger
 
 from .exception import ForceStopLoop
+from .storage import Storage
 
 
-class Database:
+class MongoDatabase(Storage):
     """
-    A class to manage MongoDB connections and operations.
+    The MongoDB storage backend.
 
     Attributes:
+        url (str): The MongoDB connection URL.
         client (Optional[AsyncClient]): The MongoDB client instance.
-        db (Optional[Any]): The database instance.
-
-    Methods:
-        connect() -> None:
-            Establishes a connection to the MongoDB server.
-
-        close() -> None:
-            Closes the MongoDB connection.
-
-        list_docs() -> List[str]:
-            Lists all document IDs in the collection.
-
-        get_doc(_id: int) -> Optional[Dict[str, Any]]:
-            Retrieves a document by its ID.
-
-        add_value(_id: int, key: str, value: Any) -> None:
-            Adds a value to a document's list field.
-
-        del_value(_id: int, key: str, value: Any) -> None:
-            Removes a value from a document's list field.
+        db (Optional[Any]): The settings collection instance.
+        users (Optional[Any]): The users collection instance, one document per user.
+        contents (Optional[Any]): The indexed database chat messages collection.
+        jobs (Optional[Any]): The broadcast jobs collection.
+        links (Optional[Any]): The stored links collection.
+    """
 
-        clear_value(_id: int, key: str) -> None:
-            Clears a field in a document.
+    name: str = "MongoDB"
 
-        del_doc(_id: int) -> None:
-            Deletes a document by its ID.
-    """
+    def __init__(self, url: str) -> None:
+        """Initializes the MongoDatabase instance with no active connection.
 
-    def __init__(self) -> None:
-        """Initializes the Database instance with no active connection."""
+        Args:
+            url (str): The MongoDB connection URL.
+        """
+        self.url = url
         self.client: Optional[AsyncClient] = None
         self.db: Optional[Any] = None
+        self.users: Optional[Any] = None
+        self.contents: Optional[Any] = None
+        self.jobs: Optional[Any] = None
+        self.links: Optional[Any] = None
 
     async def connect(self) -> None:
         """Establishes a connection to the MongoDB server."""
         while not self.client:
             try:
-                self.client = AsyncClient(config.MONGODB_URL)
+                self.client = AsyncClient(self.url)
                 self.db = self.client["FSUB_DATABASE"]["COLLECTIONS"]
+                self.users = self.client["FSUB_DATABASE"]["USERS"]
+                self.contents = self.client["FSUB_DATABASE"]["CONTENTS"]
+                self.jobs = self.client["FSUB_DATABASE"]["BROADCASTS"]
+                self.links = self.client["FSUB_DATABASE"]["LINKS"]
                 logger.info("MongoDB: Connected")
             except Exception as exc:
                 raise ForceStopLoop(str(exc))
@@ -62,6 +61,10 @@ class Database:
             await self.client.close()
             self.client = None
             self.db = None
+            self.users = None
+            self.contents = None
+            self.jobs = None
+            self.links = None
             logger.info("MongoDB: Closed")
         else:
             logger.info("MongoDB: Already Closed")
@@ -76,16 +79,19 @@ class Database:
         cursor = self.db.aggregate(pipeline)
         return [document["_id"] async for document in cursor]
 
-    async def get_doc(self, _id: int) -> Optional[Dict[str, Any]]:
+    async def get_doc(
+        self, _id: int, projection: Optional[Dict[str, int]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Retrieves a document by its ID.
 
         Args:
             _id (int): The ID of the document.
+            projection (Optional[Dict[str, int]]): The fields to include or exclude.
 
         Returns:
             Optional[Dict[str, Any]]: The document, if found.
         """
-        document = await self.db.find_one({"_id": _id})
+        document = await self.db.find_one({"_id": _id}, projection)
         return document
 
     async def add_value(self, _id: int, key: str, value: Any) -> None:
@@ -117,6 +123,57 @@ class Database:
         """
         await self.db.update_one({"_id": _id}, {"$unset": {key: ""}})
 
+    async def set_value(self, _id: int, key: str, value: Any) -> Any:
+        """Atomically sets a scalar field and returns the stored value.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be set.
+            value (Any): The new value.
+
+        Returns:
+            Any: The value stored in the document after the update.
+        """
+        document = await self.db.find_one_and_update(
+            {"_id": _id},
+            {"$set": {key: value}},
+            projection={key: 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return document.get(key)
+
+    async def set_values(self, _id: int, values: Dict[str, Any]) -> None:
+        """Sets several scalar fields in one write.
+
+        Args:
+            _id (int): The ID of the document.
+            values (Dict[str, Any]): The fields and their new values.
+        """
+        await self.db.update_one({"_id": _id}, {"$set": values}, upsert=True)
+
+    async def toggle_value(self, _id: int, key: str) -> bool:
+        """Atomically inverts a boolean field and returns the new value.
+
+        A missing field is treated as False, so the first toggle stores True.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be inverted.
+
+        Returns:
+            bool: The value stored in the document after the update.
+        """
+        pipeline = [{"$set": {key: {"$not": [{"$ifNull": [f"${key}", False]}]}}}]
+        document = await self.db.find_one_and_update(
+            {"_id": _id},
+            pipeline,
+            projection={key: 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return bool(document.get(key))
+
     async def del_doc(self, _id: int) -> None:
         """Deletes a document by its ID.
 
@@ -125,5 +182,233 @@ class Database:
         """
         await self.db.delete_one({"_id": _id})
 
+    async def add_user(self, user_id: int) -> None:
+        """Inserts a user document if it does not exist yet.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        try:
+            await self.users.insert_one({"_id": user_id})
+        except DuplicateKeyError:
+            pass
+
+    async def add_users(self, user_ids: List[int]) -> None:
+        """Inserts many user documents, skipping existing ones.
+
+        Args:
+            user_ids (List[int]): The IDs of the users.
+        """
+        if not user_ids:
+            return
+
+        requests = [InsertOne({"_id": user_id}) for user_id in user_ids]
+        try:
+            await self.users.bulk_write(requests, ordered=False)
+        except BulkWriteError as bwe:
+            # Duplicate keys are expected, anything else is a real failure
+            errors = bwe.details.get("writeErrors", [])
+            if any(error.get("code") != 11000 for error in errors):
+                raise
+
+    async def del_user(self, user_id: int) -> None:
+        """Deletes a user document.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        await self.users.delete_one({"_id": user_id})
+
+    async def del_users(self, user_ids: List[int]) -> None:
+        """Deletes many user documents in one write.
+
+        Args:
+            user_ids (List[int]): The IDs of the users.
+        """
+        if not user_ids:
+            return
+
+        await self.users.delete_many({"_id": {"$in": user_ids}})
+
+    async def get_users(self) -> List[int]:
+        """Lists all user IDs in the users collection.
+
+        Returns:
+            List[int]: A list of user IDs.
+        """
+        cursor = self.users.find({}, {"_id": 1})
+        return [document["_id"] async for document in cursor]
+
+    async def iter_users(
+        self,
+        batch_size: int = 1000,
+        exclude: Optional[List[int]] = None,
+        after: Optional[int] = None,
+    ) -> AsyncIterator[int]:
+        """Streams user IDs from the users collection in batches.
+
+        Args:
+            batch_size (int): The number of user IDs fetched per round-trip.
+            exclude (Optional[List[int]]): User IDs to leave out.
+            after (Optional[int]): Only yield user IDs greater than this one.
+
+        Yields:
+            int: A user ID, in ascending order.
+        """
+        id_filter: Dict[str, Any] = {}
+        if exclude:
+            id_filter["$nin"] = exclude
+        if after is not None:
+            id_filter["$gt"] = after
+        query = {"_id": id_filter} if id_filter else {}
+        cursor = self.users.find(query, {"_id": 1}, batch_size=batch_size).sort("_id")
+        async for document in cursor:
+            yield document["_id"]
+
+    async def count_users(self, exclude: Optional[List[int]] = None) -> Tuple[int, int]:
+        """Counts all users and the users left after an exclusion.
+
+        The total comes from the collection metadata and the excluded IDs are
+        matched on the `_id` index, so neither query scans the users.
+
+        Args:
+            exclude (Optional[List[int]]): User IDs to leave out of the count.
+
+        Returns:
+            Tuple[int, int]: The total number of users and the number of users
+                             that are not in `exclude`.
+        """
+        if not exclude:
+            total = await self.users.estimated_document_count()
+            return total, total
+
+        total, excluded = await asyncio.gather(
+            self.users.estimated_document_count(),
+            self.users.count_documents({"_id": {"$in": exclude}}),
+        )
+        return total, total - excluded
+
+    async def add_contents(self, contents: List[Dict[str, Any]]) -> None:
+        """Inserts or replaces indexed database chat messages.
+
+        Args:
+            contents (List[Dict[str, Any]]): The entries, keyed by `_id`.
+        """
+        if not contents:
+            return
+
+        requests = [
+            ReplaceOne({"_id": content["_id"]}, content, upsert=True)
+            for content in contents
+        ]
+        await self.contents.bulk_write(requests, ordered=False)
+
+    async def get_contents(self, message_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Retrieves indexed database chat messages by message ID.
+
+        Args:
+            message_ids (List[int]): The IDs of the messages.
+
+        Returns:
+            Dict[int, Dict[str, Any]]: The entries found, keyed by message ID.
+        """
+        cursor = self.contents.find({"_id": {"$in": message_ids}})
+        return {document["_id"]: document async for document in cursor}
+
+    async def del_contents(self, message_ids: List[int]) -> None:
+        """Deletes indexed database chat messages.
+
+        Args:
+            message_ids (List[int]): The IDs of the messages.
+        """
+        await self.contents.delete_many({"_id": {"$in": message_ids}})
+
+    async def save_job(self, job: Dict[str, Any]) -> None:
+        """Inserts or replaces a broadcast job.
+
+        Args:
+            job (Dict[str, Any]): The job, keyed by `_id`.
+        """
+        await self.jobs.replace_one({"_id": job["_id"]}, job, upsert=True)
+
+    async def get_jobs(self) -> List[Dict[str, Any]]:
+        """Lists all broadcast jobs.
+
+        Returns:
+            List[Dict[str, Any]]: The jobs, in creation order.
+        """
+        cursor = self.jobs.find({}).sort("_id")
+        return [document async for document in cursor]
+
+    async def del_job(self, job_id: int) -> None:
+        """Deletes a broadcast job.
+
+        Args:
+            job_id (int): The ID of the job.
+        """
+        await self.jobs.delete_one({"_id": job_id})
+
+    async def add_link(self, link: Dict[str, Any]) -> bool:
+        """Inserts a stored link unless its ID is taken.
+
+        Args:
+            link (Dict[str, Any]): The link, keyed by `_id`.
+
+        Returns:
+            bool: True if the link was inserted, False if the ID is taken.
+        """
+        try:
+            await self.links.insert_one(link)
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def get_link(self, link_id: int) -> Optional[Dict[str, Any]]:
+        """Retrieves a stored link by its ID.
+
+        Args:
+            link_id (int): The ID of the link.
+
+        Returns:
+            Optional[Dict[str, Any]]: The link, or None if not found.
+        """
+        return await self.links.find_one({"_id": link_id})
+
+    async def get_links(self, limit: int) -> List[Dict[str, Any]]:
+        """Lists the most recently created links.
 
-database: Database = Database()
+        Args:
+            limit (int): The maximum number of links.
+
+        Returns:
+            List[Dict[str, Any]]: The links, newest first.
+        """
+        cursor = self.links.find({}).sort("created_at", -1).limit(limit)
+        return [link async for link in cursor]
+
+    async def set_link_ranges(self, link_id: int, ranges: List[List[int]]) -> bool:
+        """Changes the message ID ranges of a stored link.
+
+        Args:
+            link_id (int): The ID of the link.
+            ranges (List[List[int]]): The first and last IDs of each range.
+
+        Returns:
+            bool: True if the link exists.
+        """
+        result = await self.links.update_one(
+            {"_id": link_id}, {"$set": {"ranges": ranges}}
+        )
+        return result.matched_count > 0
+
+    async def add_link_hits(self, hits: Dict[int, int]) -> None:
+        """Adds to the hit counters of many links with one bulk write.
+
+        Args:
+            hits (Dict[int, int]): The number of new hits, keyed by link ID.
+        """
+        requests = [
+            UpdateOne({"_id": link_id}, {"$inc": {"hits": count}})
+            for link_id, count in hits.items()
+        ]
+        await self.links.bulk_write(requests, ordered=False)
@@ -0,0 +1,536 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from bot.utils import logger
+
+from .exception import ForceStopLoop
+from .storage import Storage
+
+
+class SQLiteDatabase(Storage):
+    """
+    The embedded SQLite storage backend.
+
+    Settings documents are stored as JSON in the `settings` table, users in
+    the `users` table, indexed database chat messages as JSON in the
+    `contents` table, broadcast jobs as JSON in the `jobs` table and stored
+    links as JSON in the `links` table, all keyed by an indexed integer
+    primary key. The database runs in WAL mode so reads never wait on the
+    writer.
+
+    Attributes:
+        path (str): The path of the SQLite database file.
+        conn (Optional[aiosqlite.Connection]): The database connection.
+    """
+
+    name: str = "SQLite"
+
+    def __init__(self, path: str) -> None:
+        """Initializes the SQLiteDatabase instance with no active connection.
+
+        Args:
+            path (str): The path of the SQLite database file.
+        """
+        self.path = path
+        self.conn: Optional[aiosqlite.Connection] = None
+        # Serializes read-modify-write updates of the JSON documents, created
+        # in connect() so it binds to the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def connect(self) -> None:
+        """Opens the database file and creates the tables if needed."""
+        self._lock = asyncio.Lock()
+        try:
+            self.conn = await aiosqlite.connect(self.path)
+            await self.conn.execute("PRAGMA journal_mode=WAL")
+            await self.conn.execute("PRAGMA synchronous=NORMAL")
+            await self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS settings "
+                "(id INTEGER PRIMARY KEY, doc TEXT NOT NULL)"
+            )
+            await self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY)"
+            )
+            await self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS contents "
+                "(id INTEGER PRIMARY KEY, doc TEXT NOT NULL)"
+            )
+            await self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs "
+                "(id INTEGER PRIMARY KEY, doc TEXT NOT NULL)"
+            )
+            await self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS links "
+                "(id INTEGER PRIMARY KEY, doc TEXT NOT NULL)"
+            )
+            await self.conn.commit()
+            logger.info("SQLite: Connected")
+        except Exception as exc:
+            raise ForceStopLoop(str(exc))
+
+    async def close(self) -> None:
+        """Closes the database connection."""
+        if self.conn:
+            await self.conn.close()
+            self.conn = None
+            logger.info("SQLite: Closed")
+        else:
+            logger.info("SQLite: Already Closed")
+
+    async def _load_doc(self, _id: int) -> Optional[Dict[str, Any]]:
+        """Loads a settings document from its JSON row.
+
+        Args:
+            _id (int): The ID of the document.
+
+        Returns:
+            Optional[Dict[str, Any]]: The document, if found.
+        """
+        async with self.conn.execute(
+            "SELECT doc FROM settings WHERE id = ?", (_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    async def _save_doc(self, _id: int, document: Dict[str, Any]) -> None:
+        """Writes a settings document back to its JSON row.
+
+        Args:
+            _id (int): The ID of the document.
+            document (Dict[str, Any]): The document to store.
+        """
+        await self.conn.execute(
+            "INSERT OR REPLACE INTO settings (id, doc) VALUES (?, ?)",
+            (_id, json.dumps(document)),
+        )
+        await self.conn.commit()
+
+    async def _update_doc(
+        self, _id: int, update: Callable[[Dict[str, Any]], Any], upsert: bool
+    ) -> Any:
+        """Applies an in-place update to a settings document atomically.
+
+        Args:
+            _id (int): The ID of the document.
+            update (Callable[[Dict[str, Any]], Any]): Mutates the document and
+                returns the value handed back to the caller.
+            upsert (bool): Whether to create the document if it is missing.
+
+        Returns:
+            Any: The value returned by `update`, or None if nothing was updated.
+        """
+        async with self._lock:
+            document = await self._load_doc(_id)
+            if document is None:
+                if not upsert:
+                    return None
+                document = {"_id": _id}
+
+            result = update(document)
+            await self._save_doc(_id, document)
+            return result
+
+    async def list_docs(self) -> List[int]:
+        """Lists all document IDs in the settings table.
+
+        Returns:
+            List[int]: A list of document IDs.
+        """
+        async with self.conn.execute("SELECT id FROM settings") as cursor:
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def get_doc(
+        self, _id: int, projection: Optional[Dict[str, int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieves a document by its ID.
+
+        Args:
+            _id (int): The ID of the document.
+            projection (Optional[Dict[str, int]]): The fields to include or exclude.
+
+        Returns:
+            Optional[Dict[str, Any]]: The document, if found.
+        """
+        document = await self._load_doc(_id)
+        if document is None or not projection:
+            return document
+
+        if any(projection.values()):
+            keys = {key for key, value in projection.items() if value} | {"_id"}
+            return {key: value for key, value in document.items() if key in keys}
+
+        return {key: value for key, value in document.items() if key not in projection}
+
+    async def add_value(self, _id: int, key: str, value: Any) -> None:
+        """Adds a value to a document's list field.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to which the value will be added.
+            value (Any): The value to be added.
+        """
+
+        def update(document: Dict[str, Any]) -> None:
+            values = document.setdefault(key, [])
+            if value not in values:
+                values.append(value)
+
+        await self._update_doc(_id, update, upsert=True)
+
+    async def del_value(self, _id: int, key: str, value: Any) -> None:
+        """Removes a value from a document's list field.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field from which the value will be removed.
+            value (Any): The value to be removed.
+        """
+
+        def update(document: Dict[str, Any]) -> None:
+            if isinstance(document.get(key), list):
+                document[key] = [item for item in document[key] if item != value]
+
+        await self._update_doc(_id, update, upsert=False)
+
+    async def clear_value(self, _id: int, key: str) -> None:
+        """Clears a field in a document.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be cleared.
+        """
+        await self._update_doc(
+            _id, lambda document: document.pop(key, None), upsert=False
+        )
+
+    async def set_value(self, _id: int, key: str, value: Any) -> Any:
+        """Atomically sets a scalar field and returns the stored value.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be set.
+            value (Any): The new value.
+
+        Returns:
+            Any: The value stored in the document after the update.
+        """
+
+        def update(document: Dict[str, Any]) -> Any:
+            document[key] = value
+            return value
+
+        return await self._update_doc(_id, update, upsert=True)
+
+    async def set_values(self, _id: int, values: Dict[str, Any]) -> None:
+        """Sets several scalar fields in one write.
+
+        Args:
+            _id (int): The ID of the document.
+            values (Dict[str, Any]): The fields and their new values.
+        """
+        await self._update_doc(
+            _id, lambda document: document.update(values), upsert=True
+        )
+
+    async def toggle_value(self, _id: int, key: str) -> bool:
+        """Atomically inverts a boolean field and returns the new value.
+
+        A missing field is treated as False, so the first toggle stores True.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be inverted.
+
+        Returns:
+            bool: The value stored in the document after the update.
+        """
+
+        def update(document: Dict[str, Any]) -> bool:
+            document[key] = not document.get(key, False)
+            return document[key]
+
+        return await self._update_doc(_id, update, upsert=True)
+
+    async def del_doc(self, _id: int) -> None:
+        """Deletes a document by its ID.
+
+        Args:
+            _id (int): The ID of the document.
+        """
+        async with self._lock:
+            await self.conn.execute("DELETE FROM settings WHERE id = ?", (_id,))
+            await self.conn.commit()
+
+    async def add_user(self, user_id: int) -> None:
+        """Inserts a user row if it does not exist yet.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        await self.add_users([user_id])
+
+    async def add_users(self, user_ids: List[int]) -> None:
+        """Inserts many user rows, skipping existing ones.
+
+        Args:
+            user_ids (List[int]): The IDs of the users.
+        """
+        if not user_ids:
+            return
+
+        await self.conn.executemany(
+            "INSERT OR IGNORE INTO users (id) VALUES (?)",
+            [(user_id,) for user_id in user_ids],
+        )
+        await self.conn.commit()
+
+    async def del_user(self, user_id: int) -> None:
+        """Deletes a user row.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        await self.conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
+        await self.conn.commit()
+
+    async def del_users(self, user_ids: List[int]) -> None:
+        """Deletes many user rows in one transaction.
+
+        Args:
+            user_ids (List[int]): The IDs of the users.
+        """
+        if not user_ids:
+            return
+
+        await self.conn.executemany(
+            "DELETE FROM users WHERE id = ?", [(user_id,) for user_id in user_ids]
+        )
+        await self.conn.commit()
+
+    async def get_users(self) -> List[int]:
+        """Lists all user IDs in the users table.
+
+        Returns:
+            List[int]: A list of user IDs.
+        """
+        return [user_id async for user_id in self.iter_users()]
+
+    async def iter_users(
+        self,
+        batch_size: int = 1000,
+        exclude: Optional[List[int]] = None,
+        after: Optional[int] = None,
+    ) -> AsyncIterator[int]:
+        """Streams user IDs from the users table in batches.
+
+        Pages are read with a keyset on the primary key, so each batch is an
+        index range scan regardless of how far the iteration has progressed.
+
+        Args:
+            batch_size (int): The number of user IDs fetched per query.
+            exclude (Optional[List[int]]): User IDs to leave out.
+            after (Optional[int]): Only yield user IDs greater than this one.
+
+        Yields:
+            int: A user ID, in ascending order.
+        """
+        excluded = set(exclude or [])
+        last_id = after if after is not None else -(2**63)  # Smallest SQLite integer
+        while True:
+            async with self.conn.execute(
+                "SELECT id FROM users WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+            for (user_id,) in rows:
+                if user_id not in excluded:
+                    yield user_id
+
+            if len(rows) < batch_size:
+                break
+
+            last_id = rows[-1][0]
+
+    async def count_users(self, exclude: Optional[List[int]] = None) -> Tuple[int, int]:
+        """Counts all users and the users left after an exclusion.
+
+        Args:
+            exclude (Optional[List[int]]): User IDs to leave out of the count.
+
+        Returns:
+            Tuple[int, int]: The total number of users and the number of users
+                             that are not in `exclude`.
+        """
+        async with self.conn.execute("SELECT COUNT(*) FROM users") as cursor:
+            (total,) = await cursor.fetchone()
+
+        if not exclude:
+            return total, total
+
+        placeholders = ", ".join("?" for _ in exclude)
+        async with self.conn.execute(
+            f"SELECT COUNT(*) FROM users WHERE id IN ({placeholders})", tuple(exclude)
+        ) as cursor:
+            (excluded,) = await cursor.fetchone()
+
+        return total, total - excluded
+
+    async def add_contents(self, contents: List[Dict[str, Any]]) -> None:
+        """Inserts or replaces indexed database chat messages.
+
+        Args:
+            contents (List[Dict[str, Any]]): The entries, keyed by `_id`.
+        """
+        if not contents:
+            return
+
+        await self.conn.executemany(
+            "INSERT OR REPLACE INTO contents (id, doc) VALUES (?, ?)",
+            [(content["_id"], json.dumps(content)) for content in contents],
+        )
+        await self.conn.commit()
+
+    async def get_contents(self, message_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Retrieves indexed database chat messages by message ID.
+
+        Args:
+            message_ids (List[int]): The IDs of the messages.
+
+        Returns:
+            Dict[int, Dict[str, Any]]: The entries found, keyed by message ID.
+        """
+        if not message_ids:
+            return {}
+
+        placeholders = ", ".join("?" for _ in message_ids)
+        async with self.conn.execute(
+            f"SELECT id, doc FROM contents WHERE id IN ({placeholders})",
+            tuple(message_ids),
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        return {message_id: json.loads(doc) for message_id, doc in rows}
+
+    async def del_contents(self, message_ids: List[int]) -> None:
+        """Deletes indexed database chat messages.
+
+        Args:
+            message_ids (List[int]): The IDs of the messages.
+        """
+        await self.conn.executemany(
+            "DELETE FROM contents WHERE id = ?",
+            [(message_id,) for message_id in message_ids],
+        )
+        await self.conn.commit()
+
+    async def save_job(self, job: Dict[str, Any]) -> None:
+        """Inserts or replaces a broadcast job.
+
+        Args:
+            job (Dict[str, Any]): The job, keyed by `_id`.
+        """
+        await self.conn.execute(
+            "INSERT OR REPLACE INTO jobs (id, doc) VALUES (?, ?)",
+            (job["_id"], json.dumps(job)),
+        )
+        await self.conn.commit()
+
+    async def get_jobs(self) -> List[Dict[str, Any]]:
+        """Lists all broadcast jobs.
+
+        Returns:
+            List[Dict[str, Any]]: The jobs, in creation order.
+        """
+        async with self.conn.execute("SELECT doc FROM jobs ORDER BY id") as cursor:
+            return [json.loads(row[0]) for row in await cursor.fetchall()]
+
+    async def del_job(self, job_id: int) -> None:
+        """Deletes a broadcast job.
+
+        Args:
+            job_id (int): The ID of the job.
+        """
+        await self.conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        await self.conn.commit()
+
+    async def add_link(self, link: Dict[str, Any]) -> bool:
+        """Inserts a stored link unless its ID is taken.
+
+        Args:
+            link (Dict[str, Any]): The link, keyed by `_id`.
+
+        Returns:
+            bool: True if the link was inserted, False if the ID is taken.
+        """
+        cursor = await self.conn.execute(
+            "INSERT OR IGNORE INTO links (id, doc) VALUES (?, ?)",
+            (link["_id"], json.dumps(link)),
+        )
+        await self.conn.commit()
+        return cursor.rowcount > 0
+
+    async def get_link(self, link_id: int) -> Optional[Dict[str, Any]]:
+        """Retrieves a stored link by its ID.
+
+        Args:
+            link_id (int): The ID of the link.
+
+        Returns:
+            Optional[Dict[str, Any]]: The link, or None if not found.
+        """
+        async with self.conn.execute(
+            "SELECT doc FROM links WHERE id = ?", (link_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def get_links(self, limit: int) -> List[Dict[str, Any]]:
+        """Lists the most recently created links.
+
+        Args:
+            limit (int): The maximum number of links.
+
+        Returns:
+            List[Dict[str, Any]]: The links, newest first.
+        """
+        async with self.conn.execute(
+            "SELECT doc FROM links "
+            "ORDER BY json_extract(doc, '$.created_at') DESC LIMIT ?",
+            (limit,),
+        ) as cursor:
+            return [json.loads(row[0]) for row in await cursor.fetchall()]
+
+    async def set_link_ranges(self, link_id: int, ranges: List[List[int]]) -> bool:
+        """Changes the message ID ranges of a stored link.
+
+        Args:
+            link_id (int): The ID of the link.
+            ranges (List[List[int]]): The first and last IDs of each range.
+
+        Returns:
+            bool: True if the link exists.
+        """
+        cursor = await self.conn.execute(
+            "UPDATE links SET doc = json_set(doc, '$.ranges', json(?)) WHERE id = ?",
+            (json.dumps(ranges), link_id),
+        )
+        await self.conn.commit()
+        return cursor.rowcount > 0
+
+    async def add_link_hits(self, hits: Dict[int, int]) -> None:
+        """Adds to the hit counters of many links in one transaction.
+
+        Args:
+            hits (Dict[int, int]): The number of new hits, keyed by link ID.
+        """
+        await self.conn.executemany(
+            "UPDATE links SET doc = json_set(doc, '$.hits', "
+            "COALESCE(json_extract(doc, '$.hits'), 0) + ?) WHERE id = ?",
+            [(count, link_id) for link_id, count in hits.items()],
+        )
+        await self.conn.commit()
@@ -0,0 +1,227 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+
+class Storage(ABC):
+    """
+    The storage interface targeted by the `bot.db_funcs` modules.
+
+    Settings live in documents keyed by an integer ID (the bot ID), users
+    live in their own collection or table with one entry per user.
+
+    Attributes:
+        name (str): The backend name used in log messages.
+
+    Methods:
+        connect() -> None:
+            Opens the connection to the storage backend.
+
+        close() -> None:
+            Closes the connection to the storage backend.
+
+        list_docs() -> List[int]:
+            Lists all document IDs.
+
+        get_doc(_id: int, projection: Optional[Dict[str, int]]) -> Optional[Dict[str, Any]]:
+            Retrieves a document by its ID.
+
+        add_value(_id: int, key: str, value: Any) -> None:
+            Adds a value to a document's list field.
+
+        del_value(_id: int, key: str, value: Any) -> None:
+            Removes a value from a document's list field.
+
+        clear_value(_id: int, key: str) -> None:
+            Clears a field in a document.
+
+        set_value(_id: int, key: str, value: Any) -> Any:
+            Atomically sets a scalar field and returns the stored value.
+
+        set_values(_id: int, values: Dict[str, Any]) -> None:
+            Sets several scalar fields in one write.
+
+        toggle_value(_id: int, key: str) -> bool:
+            Atomically inverts a boolean field and returns the new value.
+
+        del_doc(_id: int) -> None:
+            Deletes a document by its ID.
+
+        add_user(user_id: int) -> None:
+            Inserts a user if it does not exist yet.
+
+        add_users(user_ids: List[int]) -> None:
+            Inserts many users, skipping existing ones.
+
+        del_user(user_id: int) -> None:
+            Deletes a user.
+
+        del_users(user_ids: List[int]) -> None:
+            Deletes many users in one write.
+
+        get_users() -> List[int]:
+            Lists all user IDs.
+
+        iter_users(batch_size: int, exclude: Optional[List[int]], after: Optional[int]) -> AsyncIterator[int]:
+            Streams user IDs in ascending order, in batches.
+
+        count_users(exclude: Optional[List[int]]) -> Tuple[int, int]:
+            Counts all users and the users left after an exclusion.
+
+        add_contents(contents: List[Dict[str, Any]]) -> None:
+            Inserts or replaces indexed database chat messages.
+
+        get_contents(message_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+            Retrieves indexed database chat messages by message ID.
+
+        del_contents(message_ids: List[int]) -> None:
+            Deletes indexed database chat messages.
+
+        save_job(job: Dict[str, Any]) -> None:
+            Inserts or replaces a broadcast job.
+
+        get_jobs() -> List[Dict[str, Any]]:
+            Lists all broadcast jobs.
+
+        del_job(job_id: int) -> None:
+            Deletes a broadcast job.
+
+        add_link(link: Dict[str, Any]) -> bool:
+            Inserts a stored link unless its ID is taken.
+
+        get_link(link_id: int) -> Optional[Dict[str, Any]]:
+            Retrieves a stored link by its ID.
+
+        get_links(limit: int) -> List[Dict[str, Any]]:
+            Lists the most recently created links.
+
+        set_link_ranges(link_id: int, ranges: List[List[int]]) -> bool:
+            Changes the message ID ranges of a stored link.
+
+        add_link_hits(hits: Dict[int, int]) -> None:
+            Adds to the hit counters of many links in one write.
+    """
+
+    name: str = "Storage"
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """Opens the connection to the storage backend."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Closes the connection to the storage backend."""
+
+    @abstractmethod
+    async def list_docs(self) -> List[int]:
+        """Lists all document IDs."""
+
+    @abstractmethod
+    async def get_doc(
+        self, _id: int, projection: Optional[Dict[str, int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieves a document by its ID."""
+
+    @abstractmethod
+    async def add_value(self, _id: int, key: str, value: Any) -> None:
+        """Adds a value to a document's list field."""
+
+    @abstractmethod
+    async def del_value(self, _id: int, key: str, value: Any) -> None:
+        """Removes a value from a document's list field."""
+
+    @abstractmethod
+    async def clear_value(self, _id: int, key: str) -> None:
+        """Clears a field in a document."""
+
+    @abstractmethod
+    async def set_value(self, _id: int, key: str, value: Any) -> Any:
+        """Atomically sets a scalar field and returns the stored value."""
+
+    @abstractmethod
+    async def set_values(self, _id: int, values: Dict[str, Any]) -> None:
+        """Sets several scalar fields in one write."""
+
+    @abstractmethod
+    async def toggle_value(self, _id: int, key: str) -> bool:
+        """Atomically inverts a boolean field and returns the new value."""
+
+    @abstractmethod
+    async def del_doc(self, _id: int) -> None:
+        """Deletes a document by its ID."""
+
+    @abstractmethod
+    async def add_user(self, user_id: int) -> None:
+        """Inserts a user if it does not exist yet."""
+
+    @abstractmethod
+    async def add_users(self, user_ids: List[int]) -> None:
+        """Inserts many users, skipping existing ones."""
+
+    @abstractmethod
+    async def del_user(self, user_id: int) -> None:
+        """Deletes a user."""
+
+    @abstractmethod
+    async def del_users(self, user_ids: List[int]) -> None:
+        """Deletes many users in one write."""
+
+    @abstractmethod
+    async def get_users(self) -> List[int]:
+        """Lists all user IDs."""
+
+    @abstractmethod
+    def iter_users(
+        self,
+        batch_size: int = 1000,
+        exclude: Optional[List[int]] = None,
+        after: Optional[int] = None,
+    ) -> AsyncIterator[int]:
+        """Streams user IDs in ascending order, in batches, optionally after an ID."""
+
+    @abstractmethod
+    async def count_users(self, exclude: Optional[List[int]] = None) -> Tuple[int, int]:
+        """Counts all users and the users left after an exclusion."""
+
+    @abstractmethod
+    async def add_contents(self, contents: List[Dict[str, Any]]) -> None:
+        """Inserts or replaces indexed database chat messages."""
+
+    @abstractmethod
+    async def get_contents(self, message_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Retrieves indexed database chat messages by message ID."""
+
+    @abstractmethod
+    async def del_contents(self, message_ids: List[int]) -> None:
+        """Deletes indexed database chat messages."""
+
+    @abstractmethod
+    async def save_job(self, job: Dict[str, Any]) -> None:
+        """Inserts or replaces a broadcast job."""
+
+    @abstractmethod
+    async def get_jobs(self) -> List[Dict[str, Any]]:
+        """Lists all broadcast jobs."""
+
+    @abstractmethod
+    async def del_job(self, job_id: int) -> None:
+        """Deletes a broadcast job."""
+
+    @abstractmethod
+    async def add_link(self, link: Dict[str, Any]) -> bool:
+        """Inserts a stored link unless its ID is taken."""
+
+    @abstractmethod
+    async def get_link(self, link_id: int) -> Optional[Dict[str, Any]]:
+        """Retrieves a stored link by its ID."""
+
+    @abstractmethod
+    async def get_links(self, limit: int) -> List[Dict[str, Any]]:
+        """Lists the most recently created links."""
+
+    @abstractmethod
+    async def set_link_ranges(self, link_id: int, ranges: List[List[int]]) -> bool:
+        """Changes the message ID ranges of a stored link."""
+
+    @abstractmethod
+    async def add_link_hits(self, hits: Dict[int, int]) -> None:
+        """Adds to the hit counters of many links in one write."""
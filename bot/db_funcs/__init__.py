@@ -6,19 +6,26 @@ from .content import (
     update_protect_content,
 )
 from .fsub import add_fs_chat, del_fs_chat, get_fs_chats
+from .index import add_indexed_messages, del_indexed_messages, get_indexed_messages
 from .initial import initial_database
-from .restart import (
-    add_broadcast_data_id,
-    del_broadcast_data_id,
-    get_broadcast_data_ids,
-)
+from .link import add_link, count_link_hit, get_link, get_links, set_link_ranges
+from .restart import del_broadcast_job, get_broadcast_jobs, save_broadcast_job
+from .settings import get_settings
 from .text import (
     get_force_text_msg,
     get_start_text_msg,
     update_force_text_msg,
     update_start_text_msg,
 )
-from .user import add_user, del_user, get_users
+from .user import (
+    add_user,
+    count_users,
+    del_user,
+    del_users,
+    get_users,
+    iter_users,
+    load_known_users,
+)
 
 __all__ = [
     "add_admin",
@@ -28,18 +35,31 @@ __all__ = [
     "get_protect_content",
     "update_generate_status",
     "update_protect_content",
+    "add_indexed_messages",
+    "del_indexed_messages",
+    "get_indexed_messages",
     "initial_database",
+    "add_link",
+    "get_link",
+    "get_links",
+    "set_link_ranges",
+    "count_link_hit",
     "add_fs_chat",
     "del_fs_chat",
     "get_fs_chats",
-    "add_broadcast_data_id",
-    "del_broadcast_data_id",
-    "get_broadcast_data_ids",
+    "save_broadcast_job",
+    "del_broadcast_job",
+    "get_broadcast_jobs",
+    "get_settings",
     "get_force_text_msg",
     "get_start_text_msg",
     "update_force_text_msg",
     "update_start_text_msg",
     "add_user",
+    "count_users",
     "del_user",
+    "del_users",
     "get_users",
+    "iter_users",
+    "load_known_users",
 ]
@@ -1,8 +1,10 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from bot.base import database
 from bot.utils import BOT_ID
 
+from .settings import get_settings
+
 
 async def add_admin(chat_id: int) -> None:
     """
@@ -24,14 +26,17 @@ async def del_admin(chat_id: int) -> None:
     await database.del_value(int(BOT_ID), "BOT_ADMINS", chat_id)
 
 
-async def get_admins() -> List[int]:
+async def get_admins(doc: Optional[Dict[str, Any]] = None) -> List[int]:
     """
     Retrieves the list of bot administrators.
 
+    Args:
+        doc (Optional[Dict[str, Any]]): An already fetched settings document.
+
     Returns:
         List[int]: A list of chat IDs that are administrators.
     """
-    doc: Optional[dict] = await database.get_doc(int(BOT_ID))
+    doc = await get_settings(doc)
     # Ensure `BOT_ADMINS` exists in the document and is of the correct type
     return (
         doc.get("BOT_ADMINS", [])
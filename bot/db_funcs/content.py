@@ -1,78 +1,56 @@
+from typing import Any, Dict, Optional
+
 from bot.base import database
 from bot.utils import BOT_ID
 
+from .settings import get_settings
 
-async def add_generate_status(value: bool) -> None:
-    """
-    Adds or updates the generate URL status in the database.
 
-    Args:
-        value (bool): The status to set for generating URLs.
-    """
-    await database.add_value(int(BOT_ID), "GENERATE_URL", value)
-
-
-async def del_generate_status() -> None:
-    """
-    Clears the generate URL status from the database.
-    """
-    await database.clear_value(int(BOT_ID), "GENERATE_URL")
-
-
-async def get_generate_status() -> bool:
+async def get_generate_status(doc: Optional[Dict[str, Any]] = None) -> bool:
     """
     Retrieves the current generate URL status from the database.
 
+    Args:
+        doc (Optional[Dict[str, Any]]): An already fetched settings document.
+
     Returns:
         bool: The current status of generate URLs.
     """
-    doc = await database.get_doc(int(BOT_ID))
+    doc = await get_settings(doc)
     # Assume default value of False if no status is found
-    return doc.get("GENERATE_URL", [False])[0]
-
+    return bool(doc.get("GENERATE_URL", False))
 
-async def update_generate_status() -> None:
-    """
-    Toggles the generate URL status in the database.
-    """
-    current_generate_status = await get_generate_status()
-    await del_generate_status()
-    await add_generate_status(not current_generate_status)
 
-
-async def add_protect_content(value: bool) -> None:
+async def update_generate_status() -> bool:
     """
-    Adds or updates the protect content status in the database.
-
-    Args:
-        value (bool): The status to set for protecting content.
-    """
-    await database.add_value(int(BOT_ID), "PROTECT_CONTENT", value)
-
+    Toggles the generate URL status in the database in a single atomic write.
 
-async def del_protect_content() -> None:
-    """
-    Clears the protect content status from the database.
+    Returns:
+        bool: The new status of generate URLs.
     """
-    await database.clear_value(int(BOT_ID), "PROTECT_CONTENT")
+    return await database.toggle_value(int(BOT_ID), "GENERATE_URL")
 
 
-async def get_protect_content() -> bool:
+async def get_protect_content(doc: Optional[Dict[str, Any]] = None) -> bool:
     """
     Retrieves the current protect content status from the database.
 
+    Args:
+        doc (Optional[Dict[str, Any]]): An already fetched settings document.
+
     Returns:
         bool: The current status of protecting content.
     """
-    doc = await database.get_doc(int(BOT_ID))
+    doc = await get_settings(doc)
     # Assume default value of False if no status is found
-    return doc.get("PROTECT_CONTENT", [False])[0]
+    return bool(doc.get("PROTECT_CONTENT", False))
 
 
-async def update_protect_content() -> None:
+async def update_protect_content() -> bool:
     """
-    Toggles the protect content status in the database.
+    Toggles the protect content status in the database in a single atomic write.
+
+    Returns:
+        bool: The new status of protecting content.
     """
-    current_protect_content_status = await get_protect_content()
-    await del_protect_content()
-    await add_protect_content(not current_protect_content_status)
+    return await database.toggle_value(int(BOT_ID), "PROTECT_CONTENT")
@@ -1,8 +1,10 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from bot.base import database
 from bot.utils import BOT_ID
 
+from .settings import get_settings
+
 
 async def add_fs_chat(chat_id: int) -> None:
     """
@@ -24,13 +26,16 @@ async def del_fs_chat(chat_id: int) -> None:
     await database.del_value(int(BOT_ID), "FSUB_CHATS", chat_id)
 
 
-async def get_fs_chats() -> List[int]:
+async def get_fs_chats(doc: Optional[Dict[str, Any]] = None) -> List[int]:
     """
     Retrieves the list of subscribed chat IDs.
 
+    Args:
+        doc (Optional[Dict[str, Any]]): An already fetched settings document.
+
     Returns:
         List[int]: A list of chat IDs that are subscribed.
     """
-    doc = await database.get_doc(int(BOT_ID))
+    doc = await get_settings(doc)
     # Ensure the value is a list or return an empty list
     return doc.get("FSUB_CHATS", []) if isinstance(doc.get("FSUB_CHATS"), list) else []
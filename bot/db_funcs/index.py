@@ -0,0 +1,38 @@
+from typing import Any, Dict, List
+
+from bot.base import database
+
+
+async def add_indexed_messages(entries: List[Dict[str, Any]]) -> None:
+    """
+    Records database chat messages in the content index.
+
+    Args:
+        entries (List[Dict[str, Any]]): The index entries, keyed by `_id`
+            (the message ID) with the media type, `file_id` and HTML text.
+    """
+    await database.add_contents(entries)
+
+
+async def get_indexed_messages(message_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Retrieves database chat messages from the content index.
+
+    Args:
+        message_ids (List[int]): The IDs of the messages.
+
+    Returns:
+        Dict[int, Dict[str, Any]]: The indexed entries, keyed by message ID.
+                                   Unindexed messages are left out.
+    """
+    return await database.get_contents(message_ids)
+
+
+async def del_indexed_messages(message_ids: List[int]) -> None:
+    """
+    Removes database chat messages from the content index.
+
+    Args:
+        message_ids (List[int]): The IDs of the messages.
+    """
+    await database.del_contents(message_ids)
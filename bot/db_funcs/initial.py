@@ -1,4 +1,5 @@
-from typing import Dict
+import time
+from typing import Any, Dict, Optional
 
 from bot.base import database
 from bot.utils import BOT_ID, logger
@@ -16,6 +17,11 @@ async def initial_database() -> None:
         - "PROTECT_CONTENT": False
         - "FORCE_TEXT": A default force text message
         - "START_TEXT": A default start text message
+
+    Settings stored in the legacy one-element list format are migrated
+    in place to scalar fields, legacy "BOT_USERS" arrays are moved into
+    the users collection and legacy restart data is moved into the
+    broadcast jobs collection.
     """
     default_start_text = (
         "Hello, {mention}!\n"
@@ -26,7 +32,7 @@ async def initial_database() -> None:
         "To view messages shared by bots, join first, then press the Try Again button."
     )
 
-    default_key_value_db: Dict[str, bool] = {
+    default_key_value_db: Dict[str, Any] = {
         "GENERATE_URL": False,
         "PROTECT_CONTENT": False,
         "FORCE_TEXT": default_force_text,
@@ -38,11 +44,71 @@ async def initial_database() -> None:
         bot_id
     )  # Fetch the document once to avoid multiple database calls
 
+    new_values: Dict[str, Any] = {}
     for key, value in default_key_value_db.items():
         data = key.replace("_", " ").title()
 
         if doc is None or key not in doc:
-            await database.add_value(bot_id, key, value)
+            new_values[key] = value
             logger.info(f"{data}: Default")
+        elif isinstance(doc[key], list):
+            # Legacy format stored every setting as a one-element list
+            new_values[key] = doc[key][0] if doc[key] else value
+            logger.info(f"{data}: Migrated")
         else:
             logger.info(f"{data}: Existed")
+
+    if new_values:
+        await database.set_values(bot_id, new_values)
+
+    await migrate_users(bot_id, doc)
+    await migrate_broadcast_jobs(bot_id, doc)
+
+
+async def migrate_users(bot_id: int, doc: Optional[Dict[str, Any]]) -> None:
+    """
+    Moves the legacy "BOT_USERS" array out of the bot document.
+
+    Args:
+        bot_id (int): The ID of the bot document.
+        doc (Optional[Dict[str, Any]]): The bot document, if found.
+    """
+    if doc is None or "BOT_USERS" not in doc:
+        return
+
+    user_ids = doc.get("BOT_USERS")
+    user_ids = user_ids if isinstance(user_ids, list) else []
+    await database.add_users(user_ids)
+
+    await database.clear_value(bot_id, "BOT_USERS")
+    logger.info(f"Bot Users: Migrated {len(user_ids)}")
+
+
+async def migrate_broadcast_jobs(bot_id: int, doc: Optional[Dict[str, Any]]) -> None:
+    """
+    Moves the legacy "RESTART_IDS" out of the bot document.
+
+    They only hold the admin's chat and message, so they become a job
+    without a message to broadcast, which is reported as failed.
+
+    Args:
+        bot_id (int): The ID of the bot document.
+        doc (Optional[Dict[str, Any]]): The bot document, if found.
+    """
+    if doc is None or "RESTART_IDS" not in doc:
+        return
+
+    restart_ids = doc.get("RESTART_IDS")
+    if isinstance(restart_ids, list) and restart_ids:
+        job = {
+            # Job IDs are creation times in seconds, like new broadcasts
+            "_id": int(time.time()),
+            "chat_id": restart_ids[0].get("chat_id"),
+            "message_id": restart_ids[0].get("message_id"),
+            "priority": 0,
+            "start_at": 0,
+        }
+        await database.save_job(job)
+        logger.info("Broadcast Job: Migrated")
+
+    await database.clear_value(bot_id, "RESTART_IDS")
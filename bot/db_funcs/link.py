@@ -0,0 +1,96 @@
+import secrets
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from bot.base import database, link_hits
+
+# Random link IDs of 40 bits encode to 10 characters (about 3% are shorter)
+LINK_ID_BITS: int = 40
+
+
+async def add_link(
+    ranges: List[Tuple[int, int]], created_by: Optional[int] = None
+) -> int:
+    """
+    Stores a set of message ID ranges under a new random link ID.
+
+    Args:
+        ranges (List[Tuple[int, int]]): The first and last IDs of each range.
+        created_by (Optional[int]): The ID of the admin who created the link.
+
+    Returns:
+        int: The ID of the stored link.
+    """
+    while True:
+        link_id = secrets.randbits(LINK_ID_BITS)
+        link = {
+            "_id": link_id,
+            "ranges": [list(pair) for pair in ranges],
+            "created_by": created_by,
+            "created_at": time.time(),
+            "hits": 0,
+        }
+        if await database.add_link(link):
+            return link_id
+
+
+async def get_link(link_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Retrieves a stored link.
+
+    Args:
+        link_id (int): The ID of the link.
+
+    Returns:
+        Optional[Dict[str, Any]]: The link with its `ranges`, or None if not found.
+    """
+    # Decoded IDs are unbounded, only IDs that add_link can draw are queried
+    if link_id >> LINK_ID_BITS:
+        return None
+
+    return await database.get_link(link_id)
+
+
+async def get_links(limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Retrieves the most recently created links with their hit counters.
+
+    Hits that are still buffered are not included.
+
+    Args:
+        limit (int): The maximum number of links.
+
+    Returns:
+        List[Dict[str, Any]]: The links, newest first.
+    """
+    return await database.get_links(limit)
+
+
+async def set_link_ranges(link_id: int, ranges: List[Tuple[int, int]]) -> bool:
+    """
+    Points a stored link to another set of message ID ranges.
+
+    Args:
+        link_id (int): The ID of the link.
+        ranges (List[Tuple[int, int]]): The first and last IDs of each range.
+
+    Returns:
+        bool: True if the link exists.
+    """
+    if link_id >> LINK_ID_BITS:
+        return False
+
+    return await database.set_link_ranges(link_id, [list(pair) for pair in ranges])
+
+
+def count_link_hit(link_id: int) -> None:
+    """
+    Counts one opening of a stored link.
+
+    The hit is summed in memory and written with other hits in batches,
+    so this never waits on the database.
+
+    Args:
+        link_id (int): The ID of the link.
+    """
+    link_hits.add(link_id)
@@ -1,53 +1,38 @@
-from typing import Optional, Tuple
+from typing import Any, Dict, List
 
 from bot.base import database
-from bot.utils import BOT_ID
 
 
-async def add_broadcast_data_id(chat_id: int, message_id: int) -> None:
+async def save_broadcast_job(job: Dict[str, Any]) -> None:
     """
-    Adds or updates broadcast data in the database.
+    Saves a queued or running broadcast job, or checkpoints its progress.
 
-    This function deletes any existing broadcast data and then adds new data
-    with the provided chat ID and message ID.
+    The job holds the admin's chat and command message, the message being
+    broadcast, its priority and start time, the cursor (the highest user ID
+    below which every user has been processed), the pending retries and
+    the counters.
 
     Args:
-        chat_id (int): The ID of the chat where the message is sent.
-        message_id (int): The ID of the message to broadcast.
+        job (Dict[str, Any]): The broadcast job, keyed by `_id`.
     """
-    await del_broadcast_data_id()
+    await database.save_job(job)
 
-    broadcast_data = {"chat_id": chat_id, "message_id": message_id}
-    await database.add_value(int(BOT_ID), "RESTART_IDS", broadcast_data)
 
-
-async def del_broadcast_data_id() -> None:
+async def del_broadcast_job(job_id: int) -> None:
     """
-    Clears the broadcast data from the database.
+    Removes a finished or cancelled broadcast job from the database.
+
+    Args:
+        job_id (int): The ID of the job.
     """
-    await database.clear_value(int(BOT_ID), "RESTART_IDS")
+    await database.del_job(job_id)
 
 
-async def get_broadcast_data_ids() -> Tuple[Optional[int], Optional[int]]:
+async def get_broadcast_jobs() -> List[Dict[str, Any]]:
     """
-    Retrieves the broadcast data from the database.
+    Retrieves the broadcast jobs that were queued or running when the bot stopped.
 
     Returns:
-        Tuple[Optional[int], Optional[int]]:
-            A tuple containing the chat ID and message ID. Both values are
-            `None` if no broadcast data is found.
+        List[Dict[str, Any]]: The broadcast jobs, in creation order.
     """
-    doc = await database.get_doc(int(BOT_ID))
-
-    if doc:
-        data = doc.get("RESTART_IDS")
-        if isinstance(data, list) and data:
-            broadcast_data = data[0]
-            chat_id = broadcast_data.get("chat_id")
-            message_id = broadcast_data.get("message_id")
-        else:
-            chat_id, message_id = None, None
-    else:
-        chat_id, message_id = None, None
-
-    return chat_id, message_id
+    return await database.get_jobs()
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional
+
+from bot.base import database
+from bot.utils import BOT_ID
+
+# Fields that are never needed by the settings getters
+SETTINGS_PROJECTION: Dict[str, int] = {"BOT_USERS": 0}
+
+
+async def get_settings(doc: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Retrieves the bot settings document from the database.
+
+    Args:
+        doc (Optional[Dict[str, Any]]): An already fetched settings document.
+            It is returned as is, so callers can share a single fetch.
+
+    Returns:
+        Dict[str, Any]: The settings document, or an empty dict if not found.
+    """
+    if doc is not None:
+        return doc
+
+    doc = await database.get_doc(int(BOT_ID), projection=SETTINGS_PROJECTION)
+    return doc or {}
@@ -1,27 +1,50 @@
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 
-from bot.base import database
-from bot.utils import BOT_ID
+from bot.base import database, known_users, user_buffer
+from bot.utils import logger
 
 
 async def add_user(user_id: int) -> None:
     """
-    Adds a user ID to the list of bot users in the database.
+    Queues a user ID for the bot users collection in the database.
+
+    Users that are already known are skipped, new ones are buffered and
+    flushed in batches, so this never waits on the database.
 
     Args:
         user_id (int): The ID of the user to add.
     """
-    await database.add_value(int(BOT_ID), "BOT_USERS", user_id)
+    if user_id in known_users:
+        return
+
+    known_users.add(user_id)
+    user_buffer.add(user_id)
 
 
 async def del_user(user_id: int) -> None:
     """
-    Removes a user ID from the list of bot users in the database.
+    Removes a user ID from the bot users collection in the database.
 
     Args:
         user_id (int): The ID of the user to remove.
     """
-    await database.del_value(int(BOT_ID), "BOT_USERS", user_id)
+    known_users.discard(user_id)
+    user_buffer.discard(user_id)
+    await database.del_user(user_id)
+
+
+async def del_users(user_ids: List[int]) -> None:
+    """
+    Removes many user IDs from the bot users collection in one write.
+
+    Args:
+        user_ids (List[int]): The IDs of the users to remove.
+    """
+    known_users.discard_many(user_ids)
+    for user_id in user_ids:
+        user_buffer.discard(user_id)
+
+    await database.del_users(user_ids)
 
 
 async def get_users() -> List[int]:
@@ -30,10 +53,53 @@ async def get_users() -> List[int]:
 
     Returns:
         List[int]: A list of user IDs that are associated with the bot.
-                   Returns an empty list if no users are found or if the document does not exist.
+                   Returns an empty list if no users are found.
+    """
+    return await database.get_users()
+
+
+async def iter_users(
+    batch_size: int = 1000,
+    exclude: Optional[List[int]] = None,
+    after: Optional[int] = None,
+) -> AsyncIterator[int]:
+    """
+    Streams bot user IDs from the database without loading them all at once.
+
+    Args:
+        batch_size (int): The number of user IDs fetched per round-trip.
+        exclude (Optional[List[int]]): User IDs to leave out, e.g. the admins.
+        after (Optional[int]): Only yield user IDs greater than this one, e.g. the
+            checkpoint of an interrupted broadcast.
+
+    Yields:
+        int: A user ID, in ascending order.
+    """
+    async for user_id in database.iter_users(batch_size, exclude, after):
+        yield user_id
+
+
+async def count_users(exclude: Optional[List[int]] = None) -> Tuple[int, int]:
+    """
+    Counts the bot users in the database without fetching any user IDs.
+
+    Args:
+        exclude (Optional[List[int]]): User IDs to leave out, e.g. the admins.
+
+    Returns:
+        Tuple[int, int]: The total number of users and the number of users
+                         that are not in `exclude`.
+    """
+    return await database.count_users(exclude)
+
+
+async def load_known_users() -> int:
+    """
+    Loads the IDs of existing bot users into the in-memory known-user set.
+
+    Returns:
+        int: The number of known users.
     """
-    doc = await database.get_doc(int(BOT_ID))
-    if doc:
-        return doc.get("BOT_USERS", [])
-    else:
-        return []
+    total = await known_users.load(database.iter_users(batch_size=10000))
+    logger.info(f"Known Users: {total}")
+    return total
@@ -1,11 +1,17 @@
+from .broadcast import broadcast_manager
 from .buttons import admin_buttons, helper_buttons, join_buttons
+from .delivery import message_delivery
 from .handlers import helper_handlers
+from .links import link_registry
 from .url_safe import url_safe
 
 __all__ = [
+    "broadcast_manager",
     "admin_buttons",
     "helper_buttons",
     "join_buttons",
     "helper_handlers",
+    "link_registry",
+    "message_delivery",
     "url_safe",
 ]
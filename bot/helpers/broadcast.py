@@ -0,0 +1,695 @@
+import asyncio
+import datetime
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+import hydrogram
+from hydrogram import errors
+from hydrogram.helpers import ikb
+from hydrogram.types import Message
+
+from bot.base import WriteBuffer, bot
+from bot.db_funcs import (
+    count_users,
+    del_broadcast_job,
+    del_users,
+    get_broadcast_jobs,
+    iter_users,
+    save_broadcast_job,
+)
+from bot.utils import RateLimiter, config, logger
+
+from .buttons import helper_buttons
+from .handlers import helper_handlers
+
+# Users that blocked the bot or can never be reached by it, they are removed
+BLOCKED_ERRORS = (errors.UserIsBlocked, errors.PeerIdInvalid, errors.UserIsBot)
+# Deleted accounts, they are removed
+DEACTIVATED_ERRORS = (
+    errors.InputUserDeactivated,
+    errors.UserDeactivated,
+    errors.UserDeactivatedBan,
+)
+# Transient errors worth retrying once the main stream is done, never removed
+RETRY_ERRORS = (
+    errors.Flood,
+    errors.InternalServerError,
+    errors.ServiceUnavailable,
+    asyncio.TimeoutError,
+    OSError,
+)
+
+
+class BroadcastManager:
+    """
+    Broadcasts a message to every bot user with a pool of concurrent workers.
+
+    User IDs are streamed from the database into a bounded queue and copied
+    by `BROADCAST_CONCURRENCY` workers, so throughput is bounded by Telegram's
+    rate limit rather than by round-trip time. Every send takes a token from
+    a shared `RateLimiter`, which pauses all workers and slows down on
+    FloodWait.
+
+    Sends are handled by error class: blocked and deactivated users are
+    counted and queued for removal, FloodWait and server or network errors
+    put the user in a retry queue, and other errors count as failed. The
+    retry queue is drained after the main stream, up to `MAX_ATTEMPTS`
+    attempts per user, so retries never hold up the other users. Removals
+    are flushed in batches through a `WriteBuffer`, and users are never
+    removed because of a transient error.
+
+    Broadcasts are queued as jobs with a start time and a priority and run
+    one at a time by a scheduler task, so every job shares the same rate
+    budget. A due job with a higher priority pauses the running job at the
+    next page boundary, and the paused job continues once it is done.
+
+    Jobs are saved to the database and the running job is checkpointed with
+    every progress update. Its cursor is the highest user ID below which
+    every user has been processed, so a job interrupted by a restart or
+    paused resumes after the cursor and at most one checkpoint's worth of
+    users receive it twice.
+
+    Attributes:
+        client (hydrogram.Client): The bot client instance.
+        limiter (RateLimiter): The rate limiter shared by the workers.
+        jobs (Dict[int, Dict[str, Any]]): The queued jobs, including the running one.
+        is_running (bool): Whether a broadcast is running.
+        job (Optional[Dict[str, Any]]): The running broadcast job.
+        sent (int): The number of users the message was sent to.
+        failed (int): The number of users the message could not be sent to.
+        blocked (int): The number of users who blocked the bot.
+        deactivated (int): The number of deleted accounts.
+        retried (int): The number of retried sends.
+        total (int): The number of users to broadcast to.
+
+    Methods:
+        add_job(message: Message, broadcast_msg: Message, delay: int, priority: int) -> Dict[str, Any]:
+            Queues a broadcast job.
+
+        cancel_job(job_id: int) -> bool:
+            Cancels a queued job, or stops it if it is running.
+
+        load_jobs() -> List[Dict[str, Any]]:
+            Loads the saved jobs and starts the scheduler.
+
+        fail_job(job: Dict[str, Any]) -> None:
+            Keeps a job that ended in an error and reruns it after a backoff.
+
+        queue_text() -> str:
+            Formats the queued jobs.
+
+        status_text() -> str:
+            Formats the progress counters.
+
+        update_progress(message: Message) -> None:
+            Edits the progress message with the current counters.
+    """
+
+    # Processed users between two progress updates and checkpoints
+    PROGRESS_STEP: int = 250
+    # Sends per user before a retryable error counts as failed
+    MAX_ATTEMPTS: int = 5
+    # Runs ending in an error before a job is reported as failed
+    MAX_FAILURES: int = 5
+    # Seconds before the first rerun of a job that ended in an error, doubled
+    # for every further error
+    RETRY_DELAY: int = 60
+
+    def __init__(self, client: hydrogram.Client) -> None:
+        """
+        Initializes the BroadcastManager with no running broadcast.
+
+        Args:
+            client (bot): The bot client instance.
+        """
+        self.client = client
+        self.limiter = RateLimiter(config.BROADCAST_RATE)
+        self.jobs: Dict[int, Dict[str, Any]] = {}
+        # The last job ID handed out, IDs only go up so they are never reused
+        self._last_id = 0
+        self.is_running = False
+        self.job: Optional[Dict[str, Any]] = None
+        self.sent = 0
+        self.failed = 0
+        self.blocked = 0
+        self.deactivated = 0
+        self.retried = 0
+        self.total = 0
+        self._reported = 0
+        # Users waiting for a retry and the number of attempts made so far
+        self._retries: Dict[int, int] = {}
+        # Blocked and deactivated users, removed from the database in batches
+        self.dead_users = WriteBuffer(
+            name="DeadUsers",
+            flush_func=del_users,
+            interval=config.USER_FLUSH_INTERVAL / 1000,
+            max_size=config.USER_FLUSH_SIZE,
+        )
+        # User IDs handed to the workers, in ascending order, and finished ones
+        self._pending: Deque[int] = deque()
+        self._done: Set[int] = set()
+        # The scheduler task and its wake-up signal for new jobs
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    async def add_job(
+        self,
+        message: Message,
+        broadcast_msg: Message,
+        delay: int = 0,
+        priority: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Queues a broadcast job.
+
+        Args:
+            message (Message): The admin's broadcast command.
+            broadcast_msg (Message): The message to broadcast.
+            delay (int): The number of seconds before the broadcast may start.
+            priority (int): Jobs with a higher priority run first and pause
+                running jobs with a lower priority.
+
+        Returns:
+            Dict[str, Any]: The queued job.
+        """
+        # Seconds since the epoch, bumped when several jobs start in a second
+        job_id = self._last_id = max(int(time.time()), self._last_id + 1)
+        job = {
+            "_id": job_id,
+            "chat_id": message.chat.id,
+            "message_id": message.id,
+            "progress_id": None,
+            "from_chat_id": broadcast_msg.chat.id,
+            "from_message_id": broadcast_msg.id,
+            "priority": priority,
+            "start_at": time.time() + delay,
+            "cursor": None,
+            "retries": [],
+            "sent": 0,
+            "failed": 0,
+            "blocked": 0,
+            "deactivated": 0,
+            "retried": 0,
+            "total": None,
+        }
+        # Registered before the first await, so concurrent commands get distinct IDs
+        self.jobs[job_id] = job
+        try:
+            await save_broadcast_job(job)
+        except Exception:
+            self.jobs.pop(job_id, None)
+            raise
+
+        logger.info(f"Broadcast: Queued {job_id}")
+
+        self.start()
+        self._wakeup.set()
+        return job
+
+    async def cancel_job(self, job_id: int) -> bool:
+        """
+        Cancels a queued job, or stops it if it is running.
+
+        Args:
+            job_id (int): The ID of the job.
+
+        Returns:
+            bool: True if the job was found.
+        """
+        if job_id not in self.jobs:
+            return False
+
+        if self.job and self.job["_id"] == job_id:
+            self.is_running = False
+        else:
+            await self.remove_job(job_id)
+
+        return True
+
+    async def remove_job(self, job_id: int) -> None:
+        """
+        Removes a finished or cancelled job from the queue and the database.
+
+        Args:
+            job_id (int): The ID of the job.
+        """
+        self.jobs.pop(job_id, None)
+        await del_broadcast_job(job_id)
+
+    async def load_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Loads the jobs that were queued or running when the bot stopped and starts the scheduler.
+
+        Interrupted jobs resume from their cursor in the background, so
+        startup is not delayed.
+
+        Returns:
+            List[Dict[str, Any]]: The loaded jobs.
+        """
+        jobs = await get_broadcast_jobs()
+        self.jobs = {job["_id"]: job for job in jobs}
+        self._last_id = max([self._last_id, *self.jobs])
+        self.start()
+        return jobs
+
+    def start(self) -> None:
+        """Starts the scheduler task if it is not running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.scheduler())
+
+    def next_job(self) -> Optional[Dict[str, Any]]:
+        """
+        Picks the job to run: the highest priority among the jobs due to start,
+        then the earliest start time.
+
+        Returns:
+            Optional[Dict[str, Any]]: The job, or None if no job is due.
+        """
+        now = time.time()
+        due = [job for job in self.jobs.values() if job.get("start_at", 0) <= now]
+        return max(
+            due,
+            key=lambda job: (
+                job.get("priority", 0),
+                -job.get("start_at", 0),
+                -job["_id"],
+            ),
+            default=None,
+        )
+
+    def should_yield(self, job: Dict[str, Any]) -> bool:
+        """
+        Checks whether a due job has a higher priority than the running one.
+
+        Args:
+            job (Dict[str, Any]): The running job.
+
+        Returns:
+            bool: True if the running job should be paused.
+        """
+        next_job = self.next_job()
+        return bool(next_job) and next_job.get("priority", 0) > job.get("priority", 0)
+
+    async def scheduler(self) -> None:
+        """
+        Runs the queued jobs one at a time, so they share one rate budget.
+
+        When no job is due, it sleeps until the next start time or a new job.
+        """
+        while True:
+            job = self.next_job()
+            if not job:
+                self._wakeup.clear()
+                start_times = [job.get("start_at", 0) for job in self.jobs.values()]
+                timeout = (
+                    max(min(start_times) - time.time(), 0) if start_times else None
+                )
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.run(job)
+            except Exception as exc:
+                logger.error(f"Broadcast: {exc}")
+                await self.fail_job(job)
+
+    async def fail_job(self, job: Dict[str, Any]) -> None:
+        """
+        Keeps a job whose run ended in an error and reruns it after a backoff.
+
+        The job is checkpointed so it resumes from its cursor. After
+        `MAX_FAILURES` errors it is removed and reported as failed.
+
+        Args:
+            job (Dict[str, Any]): The job that ended in an error.
+        """
+        # A job stopped with /stop is not rerun
+        stopped = self.job is job and not self.is_running
+        if self.job is job:
+            await self.checkpoint()
+        self.reset()
+
+        failures = job.get("failures", 0) + 1
+        if stopped:
+            status_msg = "<b>Broadcast Stopped</b>"
+            self.jobs.pop(job["_id"], None)
+        elif failures >= self.MAX_FAILURES:
+            status_msg = (
+                "<b>Broadcast Failed</b>: Too many errors, the job was removed."
+            )
+            self.jobs.pop(job["_id"], None)
+        else:
+            delay = self.RETRY_DELAY * 2 ** (failures - 1)
+            status_msg = f"<b>Broadcast Interrupted</b>: Retrying in {delay}s."
+            job.update(failures=failures, start_at=time.time() + delay)
+
+        try:
+            if job["_id"] in self.jobs:
+                await save_broadcast_job(job)
+            else:
+                await del_broadcast_job(job["_id"])
+        except Exception as exc:
+            logger.warning(f"Broadcast: {exc}")
+
+        try:
+            if job.get("progress_id"):
+                await self.client.edit_message_text(
+                    job["chat_id"], job["progress_id"], status_msg
+                )
+            else:
+                await self.client.send_message(
+                    job["chat_id"], status_msg, reply_to_message_id=job["message_id"]
+                )
+        except Exception as exc:
+            logger.warning(f"Broadcast: {exc}")
+
+        logger.info(f"Broadcast: Failure {failures} of {job['_id']}")
+
+    async def run(self, job: Dict[str, Any]) -> None:
+        """
+        Runs a broadcast job from its cursor until every user is processed, it
+        is stopped, or a job with a higher priority is due.
+
+        Args:
+            job (Dict[str, Any]): The broadcast job.
+        """
+        chat_id, message_id = job["chat_id"], job["message_id"]
+        broadcast_msg = None
+        if job.get("from_message_id"):
+            try:
+                broadcast_msg = await self.client.get_messages(
+                    job["from_chat_id"], job["from_message_id"]
+                )
+            except errors.RPCError:
+                pass
+
+        if not broadcast_msg or broadcast_msg.empty:
+            await self.client.send_message(
+                chat_id, "<b>An Error Occurred!</b>", reply_to_message_id=message_id
+            )
+            await self.remove_job(job["_id"])
+            return
+
+        # A paused or interrupted job gets a new progress message
+        if job.get("progress_id"):
+            try:
+                await self.client.delete_messages(chat_id, job["progress_id"])
+            except errors.RPCError:
+                pass
+
+        progress_msg = await self.client.send_message(
+            chat_id,
+            "<b>Broadcasting...</b>",
+            reply_to_message_id=message_id,
+            reply_markup=ikb(helper_buttons.Broadcast),
+        )
+        job["progress_id"] = progress_msg.id
+
+        if job.get("total") is None:
+            _, job["total"] = await count_users(exclude=helper_handlers.admins)
+
+        logger.info(f"Broadcast: Starting {job['_id']} after {job['cursor']}")
+        self.job, self.is_running = job, True
+        self.sent, self.failed, self.total = job["sent"], job["failed"], job["total"]
+        self.blocked, self.retried = job.get("blocked", 0), job.get("retried", 0)
+        self.deactivated = job.get("deactivated", 0)
+        self._retries = {user_id: 1 for user_id in job.get("retries", [])}
+        self._reported = self.processed
+        await save_broadcast_job(job)
+
+        # A small buffer keeps the workers busy without loading every user ID
+        user_ids: asyncio.Queue = asyncio.Queue(maxsize=config.BROADCAST_CONCURRENCY)
+        workers = [
+            asyncio.create_task(self.worker(user_ids, broadcast_msg, progress_msg))
+            for _ in range(config.BROADCAST_CONCURRENCY)
+        ]
+
+        preempted = False
+        try:
+            streamed = 0
+            async for user_id in iter_users(
+                exclude=helper_handlers.admins, after=job["cursor"]
+            ):
+                if not self.is_running:
+                    break
+
+                # Higher-priority jobs take over at page boundaries
+                if streamed % self.PROGRESS_STEP == 0 and self.should_yield(job):
+                    preempted = True
+                    break
+
+                streamed += 1
+                self._pending.append(user_id)
+                await user_ids.put((user_id, 0))
+
+            # Retries are sent once the main stream is done, each round may
+            # queue more retries until the attempts are used up
+            while self.is_running and not preempted:
+                await user_ids.join()
+                retries = list(self._retries.items())
+                if not retries:
+                    break
+
+                for item in retries:
+                    await user_ids.put(item)
+        finally:
+            for _ in workers:
+                await user_ids.put(None)
+            await asyncio.gather(*workers)
+
+        if preempted:
+            await self.pause_broadcast(progress_msg)
+        else:
+            await self.finalize_broadcast(progress_msg)
+
+    async def worker(
+        self, user_ids: asyncio.Queue, broadcast_msg: Message, progress_msg: Message
+    ) -> None:
+        """
+        Sends the broadcast to queued users until a `None` sentinel is received.
+
+        Args:
+            user_ids (asyncio.Queue): The queue of (user ID, attempts made) pairs.
+            broadcast_msg (Message): The message to broadcast.
+            progress_msg (Message): The progress message to update.
+        """
+        while (item := await user_ids.get()) is not None:
+            try:
+                # Drain the queue without sending once the broadcast is stopped
+                if not self.is_running:
+                    continue
+
+                user_id, attempts = item
+                await self.send(user_id, attempts, broadcast_msg)
+                if not attempts:
+                    self.advance_cursor(user_id)
+
+                if self.processed - self._reported >= self.PROGRESS_STEP:
+                    self._reported = self.processed
+                    await self.checkpoint()
+                    await self.update_progress(progress_msg)
+            finally:
+                user_ids.task_done()
+
+    async def send(self, user_id: int, attempts: int, broadcast_msg: Message) -> None:
+        """
+        Copies the broadcast to a user within the shared rate limit.
+
+        Args:
+            user_id (int): The ID of the user.
+            attempts (int): The number of earlier attempts for this user.
+            broadcast_msg (Message): The message to broadcast.
+        """
+        if attempts:
+            self.retried += 1
+
+        await self.limiter.acquire()
+        try:
+            await broadcast_msg.copy(
+                user_id, protect_content=helper_handlers.protect_content
+            )
+            self.sent += 1
+        except RETRY_ERRORS as exc:
+            if isinstance(exc, errors.FloodWait):
+                logger.warning(f"FloodWait: Sleep {exc.value}")
+                self.limiter.slow_down(exc.value)
+
+            if attempts + 1 < self.MAX_ATTEMPTS:
+                self._retries[user_id] = attempts + 1
+                return
+
+            self.failed += 1
+        except BLOCKED_ERRORS:
+            self.dead_users.add(user_id)
+            self.blocked += 1
+        except DEACTIVATED_ERRORS:
+            self.dead_users.add(user_id)
+            self.deactivated += 1
+        except errors.RPCError:
+            self.failed += 1
+
+        self._retries.pop(user_id, None)
+
+    @property
+    def processed(self) -> int:
+        """The number of users the broadcast is done with."""
+        return self.sent + self.failed + self.blocked + self.deactivated
+
+    def advance_cursor(self, user_id: int) -> None:
+        """
+        Marks a user as processed and moves the cursor past finished users.
+
+        Workers finish out of order, so the cursor only moves over the
+        leading run of finished user IDs.
+
+        Args:
+            user_id (int): The ID of the processed user.
+        """
+        self._done.add(user_id)
+        while self._pending and self._pending[0] in self._done:
+            self.job["cursor"] = self._pending.popleft()
+            self._done.discard(self.job["cursor"])
+
+    async def checkpoint(self) -> None:
+        """Saves the cursor and counters of the running job to the database."""
+        self.job.update(
+            retries=list(self._retries),
+            sent=self.sent,
+            failed=self.failed,
+            blocked=self.blocked,
+            deactivated=self.deactivated,
+            retried=self.retried,
+        )
+        try:
+            await save_broadcast_job(self.job)
+        except Exception as exc:
+            logger.warning(f"Broadcast: {exc}")
+
+    def status_text(self) -> str:
+        """
+        Formats the progress counters.
+
+        Returns:
+            str: The broadcast status text.
+        """
+        return "<b>Broadcast Status</b>:\n" + self.counters_text()
+
+    def counters_text(self) -> str:
+        """
+        Formats the sent, blocked, deactivated, failed and retried counters.
+
+        Returns:
+            str: The counters, one per line.
+        """
+        return (
+            f"  - <code>Sent       :</code> {self.sent} - {self.total}\n"
+            f"  - <code>Blocked    :</code> {self.blocked}\n"
+            f"  - <code>Deactivated:</code> {self.deactivated}\n"
+            f"  - <code>Failed     :</code> {self.failed}\n"
+            f"  - <code>Retried    :</code> {self.retried}"
+        )
+
+    def queue_text(self) -> str:
+        """
+        Formats the queued jobs in the order they will run.
+
+        Returns:
+            str: The broadcast queue text.
+        """
+        if not self.jobs:
+            return "<b>Broadcast Queue</b>: Empty"
+
+        lines = []
+        jobs = sorted(
+            self.jobs.values(),
+            key=lambda job: (
+                -job.get("priority", 0),
+                job.get("start_at", 0),
+                job["_id"],
+            ),
+        )
+        for job in jobs:
+            if self.job and self.job["_id"] == job["_id"]:
+                state = "Running"
+            elif job.get("cursor") is not None:
+                state = "Paused"
+            else:
+                start_at = datetime.datetime.fromtimestamp(job.get("start_at", 0))
+                state = start_at.strftime("%B %d, %Y at %I:%M %p")
+
+            lines.append(
+                f"  - <code>ID {job['_id']}:</code> Priority {job.get('priority', 0)}, {state}"
+            )
+
+        return "<b>Broadcast Queue</b>:\n" + "\n".join(lines)
+
+    async def update_progress(self, message: Message) -> None:
+        """
+        Edits the progress message with the current counters.
+
+        Args:
+            message (Message): The progress message.
+        """
+        try:
+            await message.edit_text(
+                self.status_text(), reply_markup=ikb(helper_buttons.Broadcast)
+            )
+        except errors.RPCError:
+            pass
+
+    async def pause_broadcast(self, progress_msg: Message) -> None:
+        """
+        Checkpoints a preempted job, which stays queued, and resets the counters.
+
+        Args:
+            progress_msg (Message): The progress message.
+        """
+        await self.checkpoint()
+        try:
+            await progress_msg.edit_text(
+                "<b>Broadcast Paused</b>: A higher-priority broadcast is running.\n"
+                + self.counters_text()
+            )
+        except errors.RPCError:
+            pass
+
+        logger.info(f"Broadcast: Paused {self.job['_id']}")
+        self.reset()
+
+    async def finalize_broadcast(self, progress_msg: Message) -> None:
+        """
+        Reports the result of the broadcast and resets the counters.
+
+        Args:
+            progress_msg (Message): The progress message to delete.
+        """
+        status_msg = "Broadcast Finished" if self.is_running else "Broadcast Stopped"
+
+        await self.client.send_message(
+            self.job["chat_id"],
+            f"<b>{status_msg}</b>\n" + self.counters_text(),
+            reply_to_message_id=self.job["message_id"],
+            reply_markup=ikb(helper_buttons.Close),
+        )
+
+        logger.info(status_msg)
+        await self.dead_users.close()
+        await self.remove_job(self.job["_id"])
+        await progress_msg.delete()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the running job and its counters."""
+        self.is_running, self.sent, self.failed, self.total = False, 0, 0, 0
+        self.blocked, self.deactivated, self.retried = 0, 0, 0
+        self.job, self._reported = None, 0
+        self._retries.clear()
+        self._pending.clear()
+        self._done.clear()
+
+
+broadcast_manager: BroadcastManager = BroadcastManager(bot)
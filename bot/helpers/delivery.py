@@ -0,0 +1,378 @@
+import asyncio
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar, Union
+
+import hydrogram
+from hydrogram import enums, errors, raw
+from hydrogram.types import Message
+
+from bot.base import bot
+from bot.db_funcs import (
+    add_indexed_messages,
+    del_indexed_messages,
+    get_indexed_messages,
+)
+from bot.utils import TTLCache, config, logger
+
+T = TypeVar("T")
+
+# A fetched database chat message or its content index entry
+Item = Union[Message, Dict[str, Any]]
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Splits items into consecutive chunks without materializing them.
+
+    Args:
+        items (Iterable[T]): The items, e.g. a `range` of message IDs.
+        size (int): The maximum number of items per chunk.
+
+    Yields:
+        List[T]: The next chunk of items.
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def index_entry(msg: Message) -> Optional[Dict[str, Any]]:
+    """
+    Builds the content index entry of a database chat message.
+
+    The text or caption is stored as HTML, so its entities survive without
+    serializing `MessageEntity` objects.
+
+    Args:
+        msg (Message): The database chat message.
+
+    Returns:
+        Optional[Dict[str, Any]]: The entry, or None if the message can only
+                                  be delivered by copying it from the chat.
+    """
+    if msg.empty or msg.service or msg.reply_markup:
+        return None
+
+    if msg.text:
+        return {
+            "_id": msg.id,
+            "type": "text",
+            "file_id": None,
+            "text": msg.text.html,
+            "web_page": bool(msg.web_page),
+        }
+
+    media = msg.media.value if msg.media else None
+    file = getattr(msg, media, None) if media else None
+    if not getattr(file, "file_id", None):
+        return None
+
+    return {
+        "_id": msg.id,
+        "type": media,
+        "file_id": file.file_id,
+        "text": msg.caption.html if msg.caption else "",
+        "web_page": False,
+    }
+
+
+def item_id(item: Item) -> int:
+    """
+    Returns the database chat message ID of a delivery item.
+
+    Args:
+        item (Item): A fetched message or a content index entry.
+
+    Returns:
+        int: The message ID.
+    """
+    return item["_id"] if isinstance(item, dict) else item.id
+
+
+class MessageDelivery:
+    """
+    Delivers stored messages from the database chat to users.
+
+    Messages are resolved in pages of up to 200 IDs, and the next page is
+    resolved while the current one is being sent, so the first messages go
+    out right away even for large batches. Each page is sent with Telegram's
+    bulk forward RPC, dropping the author so messages arrive as copies, up
+    to 100 per call. A chunk that cannot be forwarded in bulk falls back to
+    sending its messages one by one.
+
+    Resolving a page checks a bounded LRU/TTL cache first, then the content
+    index (file_id, type and HTML text recorded when a link is created), and
+    only fetches unindexed messages from the database chat. Indexed messages
+    are sent with `send_cached_media`/`send_message` in the fallback path, so
+    the database chat is only touched for unindexed or stale entries. Edited
+    or deleted database chat messages are re-indexed or dropped.
+    """
+
+    # Telegram's limit of message IDs per GetMessages call
+    FETCH_SIZE: int = 200
+    # Telegram's limit of message IDs per ForwardMessages call
+    CHUNK_SIZE: int = 100
+
+    def __init__(self, client: hydrogram.Client) -> None:
+        """
+        Initializes the MessageDelivery with the given bot client.
+
+        Args:
+            client (bot): The bot client instance.
+        """
+        self.client = client
+        self.cache = TTLCache(config.MESSAGE_CACHE_SIZE, config.MESSAGE_CACHE_TTL)
+
+    async def send_messages(
+        self, user_id: int, message_ids: Iterable[int], protect_content: bool
+    ) -> None:
+        """
+        Sends the stored messages to a user, pipelining lookups and sends.
+
+        Args:
+            user_id (int): The ID of the user receiving the messages.
+            message_ids (Iterable[int]): The IDs of the messages in the database chat.
+            protect_content (bool): Whether to protect the sent messages.
+        """
+        # A single slot lets exactly one page be resolved ahead of the sender
+        pages: asyncio.Queue = asyncio.Queue(maxsize=1)
+        fetcher = asyncio.create_task(self.fetch_pages(message_ids, pages))
+        try:
+            while (items := await pages.get()) is not None:
+                await self.send_page(user_id, items, protect_content)
+        finally:
+            fetcher.cancel()
+
+    async def fetch_pages(
+        self, message_ids: Iterable[int], pages: asyncio.Queue
+    ) -> None:
+        """
+        Resolves the stored messages page by page and queues them.
+
+        A `None` sentinel is queued once all pages are resolved or a lookup fails.
+
+        Args:
+            message_ids (Iterable[int]): The IDs of the messages in the database chat.
+            pages (asyncio.Queue): The queue of resolved pages.
+        """
+        try:
+            for page in chunked(message_ids, self.FETCH_SIZE):
+                await pages.put(await self.get_page(page))
+        except Exception as exc:
+            logger.warning(f"Delivery: {exc}")
+
+        await pages.put(None)
+
+    async def get_page(self, page: List[int]) -> List[Item]:
+        """
+        Resolves up to 200 messages from the cache, the index or the chat.
+
+        Args:
+            page (List[int]): The IDs of the messages in the database chat.
+
+        Returns:
+            List[Item]: The existing messages in page order.
+        """
+        items: Dict[int, Optional[Item]] = {
+            message_id: self.cache.get(message_id) for message_id in page
+        }
+
+        missing_ids = [message_id for message_id, item in items.items() if not item]
+        if missing_ids:
+            for message_id, entry in (await get_indexed_messages(missing_ids)).items():
+                items[message_id] = entry
+                self.cache.set(message_id, entry)
+
+        missing_ids = [message_id for message_id, item in items.items() if not item]
+        if missing_ids:
+            msgs = await self.fetch_messages(missing_ids)
+            # Empty messages are not cached, the ID may still be posted later
+            msgs = [msg for msg in msgs if not msg.empty]
+            for msg in msgs:
+                items[msg.id] = msg
+                self.cache.set(msg.id, msg)
+
+            # Index the messages of links created before the index existed
+            await add_indexed_messages(
+                [entry for entry in map(index_entry, msgs) if entry]
+            )
+
+        return [item for item in items.values() if item]
+
+    async def fetch_messages(self, message_ids: List[int]) -> List[Message]:
+        """
+        Fetches up to 200 messages from the database chat.
+
+        Args:
+            message_ids (List[int]): The IDs of the messages in the database chat.
+
+        Returns:
+            List[Message]: The fetched messages, including empty ones.
+        """
+        try:
+            return await self.client.get_messages(config.DATABASE_CHAT_ID, message_ids)
+        except errors.FloodWait as fw:
+            logger.warning(f"FloodWait: Sleep {fw.value}")
+            await asyncio.sleep(fw.value)
+            return await self.client.get_messages(config.DATABASE_CHAT_ID, message_ids)
+
+    async def index_messages(self, message_ids: Iterable[int]) -> int:
+        """
+        Records database chat messages in the content index.
+
+        Args:
+            message_ids (Iterable[int]): The IDs of the messages in the database chat.
+
+        Returns:
+            int: The number of indexed messages.
+        """
+        indexed = 0
+        for page in chunked(message_ids, self.FETCH_SIZE):
+            msgs = await self.fetch_messages(page)
+            entries = [entry for entry in map(index_entry, msgs) if entry]
+            await add_indexed_messages(entries)
+            indexed += len(entries)
+
+        return indexed
+
+    async def index_message(self, msg: Message) -> None:
+        """
+        Records a new or edited database chat message in the content index.
+
+        Args:
+            msg (Message): The database chat message.
+        """
+        self.cache.pop(msg.id)
+        entry = index_entry(msg)
+        if entry:
+            await add_indexed_messages([entry])
+        else:
+            await del_indexed_messages([msg.id])
+
+    async def forget(self, message_ids: List[int]) -> None:
+        """
+        Drops deleted database chat messages from the cache and the index.
+
+        Args:
+            message_ids (List[int]): The IDs of the deleted messages.
+        """
+        for message_id in message_ids:
+            self.cache.pop(message_id)
+
+        await del_indexed_messages(message_ids)
+
+    async def send_page(
+        self, user_id: int, items: List[Item], protect_content: bool
+    ) -> None:
+        """
+        Sends a page of resolved messages to a user in bulk.
+
+        A chunk hit by a FloodWait is forwarded again once after the wait.
+        Chunks the bulk call rejects for other reasons are sent one by one.
+
+        Args:
+            user_id (int): The ID of the user receiving the messages.
+            items (List[Item]): The resolved messages.
+            protect_content (bool): Whether to protect the sent messages.
+        """
+        for chunk in chunked(items, self.CHUNK_SIZE):
+            message_ids = [item_id(item) for item in chunk]
+            try:
+                try:
+                    await self.forward_chunk(user_id, message_ids, protect_content)
+                except errors.FloodWait as fw:
+                    # One bulk retry, per-message sends would flood harder
+                    logger.warning(f"FloodWait: Sleep {fw.value}")
+                    await asyncio.sleep(fw.value)
+                    await self.forward_chunk(user_id, message_ids, protect_content)
+            except errors.FloodWait:
+                raise
+            except errors.RPCError:
+                await self.copy_chunk(user_id, chunk, protect_content)
+
+    async def forward_chunk(
+        self, user_id: int, chunk: List[int], protect_content: bool
+    ) -> None:
+        """
+        Copies up to 100 messages to a user with a single ForwardMessages call.
+
+        Args:
+            user_id (int): The ID of the user receiving the messages.
+            chunk (List[int]): The IDs of the messages in the database chat.
+            protect_content (bool): Whether to protect the sent messages.
+        """
+        await self.client.invoke(
+            raw.functions.messages.ForwardMessages(
+                from_peer=await self.client.resolve_peer(config.DATABASE_CHAT_ID),
+                to_peer=await self.client.resolve_peer(user_id),
+                id=chunk,
+                random_id=[self.client.rnd_id() for _ in chunk],
+                drop_author=True,
+                noforwards=protect_content,
+            )
+        )
+
+    async def copy_chunk(
+        self, user_id: int, chunk: List[Item], protect_content: bool
+    ) -> None:
+        """
+        Sends messages to a user one by one, skipping the ones that fail.
+
+        Args:
+            user_id (int): The ID of the user receiving the messages.
+            chunk (List[Item]): The resolved messages.
+            protect_content (bool): Whether to protect the sent messages.
+        """
+        for item in chunk:
+            try:
+                await self.send_item(user_id, item, protect_content)
+            except errors.FloodWait as fw:
+                logger.warning(f"FloodWait: Sleep {fw.value}")
+                await asyncio.sleep(fw.value)
+                await self.send_item(user_id, item, protect_content)
+            except errors.RPCError:
+                continue
+
+    async def send_item(self, user_id: int, item: Item, protect_content: bool) -> None:
+        """
+        Sends a single message, from its index entry when possible.
+
+        A stale index entry (e.g. an expired file reference) falls back to
+        copying the message from the database chat.
+
+        Args:
+            user_id (int): The ID of the user receiving the message.
+            item (Item): A fetched message or a content index entry.
+            protect_content (bool): Whether to protect the sent message.
+        """
+        if not isinstance(item, dict):
+            await item.copy(user_id, protect_content=protect_content)
+            return
+
+        try:
+            if item["file_id"]:
+                await self.client.send_cached_media(
+                    user_id,
+                    item["file_id"],
+                    caption=item["text"],
+                    parse_mode=enums.ParseMode.HTML,
+                    protect_content=protect_content,
+                )
+            else:
+                await self.client.send_message(
+                    user_id,
+                    item["text"],
+                    parse_mode=enums.ParseMode.HTML,
+                    disable_web_page_preview=not item["web_page"],
+                    protect_content=protect_content,
+                )
+        except errors.FloodWait:
+            raise
+        except errors.RPCError:
+            self.cache.pop(item["_id"])
+            msg = await self.client.get_messages(config.DATABASE_CHAT_ID, item["_id"])
+            if not msg.empty:
+                await msg.copy(user_id, protect_content=protect_content)
+
+
+message_delivery: MessageDelivery = MessageDelivery(bot)
@@ -1,4 +1,6 @@
-from typing import Dict, List, Optional, Union
+import asyncio
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import hydrogram
 from hydrogram import enums, errors
@@ -11,14 +13,21 @@ from bot.db_funcs import (
     get_fs_chats,
     get_generate_status,
     get_protect_content,
+    get_settings,
     get_start_text_msg,
 )
-from bot.utils import config, logger
+from bot.utils import TTLCache, config, logger
 
+from .links import link_registry
 from .url_safe import url_safe
 
 
 class HelperHandlers:
+    # Maximum number of concurrent get_chat_member calls across all updates
+    MEMBER_CHECKS: int = 10
+    # Telegram message IDs are signed 32-bit integers
+    MAX_MESSAGE_ID: int = 2**31 - 1
+
     def __init__(self, client: hydrogram.Client) -> None:
         """
         Initializes the HelperHandlers with the given bot client.
@@ -33,35 +42,67 @@ class HelperHandlers:
         self.fs_chats: Dict[int, Dict[str, Union[str, str]]] = {}
         self.protect_content: bool = False
         self.generate_status: bool = False
+        # Membership of (user_id, chat_id) pairs in the subscription chats
+        self.members = TTLCache(config.MEMBER_CACHE_SIZE, config.MEMBER_CACHE_TTL)
+        self.member_checks = asyncio.Semaphore(self.MEMBER_CHECKS)
+        # Decoded start payloads, keyed by the payload
+        self.payloads = TTLCache(config.PAYLOAD_CACHE_SIZE)
+
+    async def settings_init(self) -> Dict[str, Any]:
+        """
+        Initializes every cached setting from a single fetch of the settings document.
 
-    async def start_text_init(self) -> str:
+        Returns:
+            Dict[str, Any]: The settings document.
+        """
+        settings = await get_settings()
+        await asyncio.gather(
+            self.start_text_init(settings),
+            self.force_text_init(settings),
+            self.generate_status_init(settings),
+            self.protect_content_init(settings),
+            self.admins_init(settings),
+            self.fs_chats_init(settings),
+        )
+        return settings
+
+    async def start_text_init(self, settings: Optional[Dict[str, Any]] = None) -> str:
         """
         Initializes the start text from the database.
 
+        Args:
+            settings (Optional[Dict[str, Any]]): An already fetched settings document.
+
         Returns:
             str: The start text.
         """
-        self.start_text = await get_start_text_msg()
+        self.start_text = await get_start_text_msg(settings)
         return self.start_text
 
-    async def force_text_init(self) -> str:
+    async def force_text_init(self, settings: Optional[Dict[str, Any]] = None) -> str:
         """
         Initializes the force text from the database.
 
+        Args:
+            settings (Optional[Dict[str, Any]]): An already fetched settings document.
+
         Returns:
             str: The force text.
         """
-        self.force_text = await get_force_text_msg()
+        self.force_text = await get_force_text_msg(settings)
         return self.force_text
 
-    async def admins_init(self) -> List[int]:
+    async def admins_init(self, settings: Optional[Dict[str, Any]] = None) -> List[int]:
         """
         Initializes the list of admin user IDs from the database and adds the owner ID.
 
+        Args:
+            settings (Optional[Dict[str, Any]]): An already fetched settings document.
+
         Returns:
             List[int]: A list of admin user IDs.
         """
-        admin_ids = await get_admins()
+        admin_ids = await get_admins(settings)
         self.admins = admin_ids + [config.OWNER_ID] if admin_ids else [config.OWNER_ID]
 
         for i, user_id in enumerate(self.admins):
@@ -69,60 +110,94 @@ class HelperHandlers:
 
         return self.admins
 
-    async def fs_chats_init(self) -> Dict[int, Dict[str, Union[str, str]]]:
+    async def fs_chats_init(
+        self, settings: Optional[Dict[str, Any]] = None
+    ) -> Dict[int, Dict[str, Union[str, str]]]:
         """
         Initializes the list of free subscription chats from the database and verifies their details.
 
+        Args:
+            settings (Optional[Dict[str, Any]]): An already fetched settings document.
+
         Returns:
             Dict[int, Dict[str, Union[str, str]]]: A dictionary of chat details.
         """
         self.fs_chats.clear()  # Restore to default
-        fs_chats = await get_fs_chats()
+        self.members.clear()  # Memberships of removed chats are no longer tracked
+        fs_chats = await get_fs_chats(settings)
         if fs_chats:
-            for i, chat_id in enumerate(fs_chats):
-                try:
-                    chat = await self.client.get_chat(chat_id=chat_id)
-                    chat_type = (
-                        "Group"
-                        if chat.type
-                        in [enums.ChatType.GROUP, enums.ChatType.SUPERGROUP]
-                        else "Channel"
-                    )
-                    invite_link = chat.invite_link
-                    if not invite_link:
-                        raise errors.RPCError
-
-                    self.fs_chats[chat_id] = {
-                        "chat_type": chat_type,
-                        "invite_link": invite_link,
-                    }
-                    logger.info(f"Sub. Chat {i + 1}: {chat_id}")
-                except errors.RPCError as rpc:
-                    logger.warning(f"Sub. Chat {i + 1}: {rpc.MESSAGE}")
+            # Resolved concurrently, then recorded in the configured order
+            chats = await asyncio.gather(
+                *(self.fetch_fs_chat(chat_id) for chat_id in fs_chats),
+                return_exceptions=True,
+            )
+            for i, (chat_id, chat) in enumerate(zip(fs_chats, chats)):
+                if isinstance(chat, errors.RPCError):
+                    logger.warning(f"Sub. Chat {i + 1}: {chat.MESSAGE}")
                     await del_fs_chat(chat_id)
+                elif isinstance(chat, BaseException):
+                    raise chat
+                else:
+                    self.fs_chats[chat_id] = chat
+                    logger.info(f"Sub. Chat {i + 1}: {chat_id}")
         else:
             logger.info("Sub. Chats: None")
 
         return self.fs_chats
 
-    async def protect_content_init(self) -> bool:
+    async def fetch_fs_chat(self, chat_id: int) -> Dict[str, str]:
+        """
+        Retrieves the type and invite link of a subscription chat.
+
+        Args:
+            chat_id (int): The ID of the chat.
+
+        Returns:
+            Dict[str, str]: The chat type and invite link.
+
+        Raises:
+            errors.RPCError: If the chat is unreachable or has no invite link.
+        """
+        chat = await self.client.get_chat(chat_id=chat_id)
+        chat_type = (
+            "Group"
+            if chat.type in [enums.ChatType.GROUP, enums.ChatType.SUPERGROUP]
+            else "Channel"
+        )
+        invite_link = chat.invite_link
+        if not invite_link:
+            raise errors.RPCError
+
+        return {"chat_type": chat_type, "invite_link": invite_link}
+
+    async def protect_content_init(
+        self, settings: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """
         Initializes the content protection status from the database.
 
+        Args:
+            settings (Optional[Dict[str, Any]]): An already fetched settings document.
+
         Returns:
             bool: The content protection status.
         """
-        self.protect_content = await get_protect_content()
+        self.protect_content = await get_protect_content(settings)
         return self.protect_content
 
-    async def generate_status_init(self) -> bool:
+    async def generate_status_init(
+        self, settings: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """
         Initializes the generate status from the database.
 
+        Args:
+            settings (Optional[Dict[str, Any]]): An already fetched settings document.
+
         Returns:
             bool: The generate status.
         """
-        self.generate_status = await get_generate_status()
+        self.generate_status = await get_generate_status(settings)
         return self.generate_status
 
     async def user_is_not_join(self, user_id: int) -> Optional[List[int]]:
@@ -139,38 +214,255 @@ class HelperHandlers:
         if not chat_ids or user_id in self.admins:
             return None
 
-        already_joined = set()
-        for chat_id in chat_ids:
-            try:
+        # The chats are checked concurrently, so the gate costs one round-trip
+        joined = await asyncio.gather(
+            *(self.is_member(user_id, chat_id) for chat_id in chat_ids)
+        )
+        return [
+            chat_id for chat_id, is_member in zip(chat_ids, joined) if not is_member
+        ]
+
+    async def is_member(self, user_id: int, chat_id: int) -> bool:
+        """
+        Checks whether the user has joined a subscription chat, using the membership cache.
+
+        Members are cached for `MEMBER_CACHE_TTL` seconds and non-members for the
+        shorter `MEMBER_CACHE_NEGATIVE_TTL`, so a user who joins and taps
+        "Try Again" is not held back for long. Other errors are not cached.
+
+        Args:
+            user_id (int): The ID of the user to check.
+            chat_id (int): The ID of the subscription chat.
+
+        Returns:
+            bool: True if the user is a member of the chat.
+        """
+        is_member = self.members.get((user_id, chat_id))
+        if is_member is not None:
+            return is_member
+
+        try:
+            async with self.member_checks:
                 await self.client.get_chat_member(chat_id, user_id)
-                already_joined.add(chat_id)
-            except errors.RPCError:
-                continue
+        except errors.UserNotParticipant:
+            self.members.set(
+                (user_id, chat_id), False, ttl=config.MEMBER_CACHE_NEGATIVE_TTL
+            )
+            return False
+        except errors.RPCError:
+            return False
+
+        self.members.set((user_id, chat_id), True)
+        return True
+
+    def track_member(self, user_id: int, chat_id: int, is_member: bool) -> None:
+        """
+        Records a membership change reported by a chat member update.
 
-        return [chat_id for chat_id in chat_ids if chat_id not in already_joined]
+        Updates are authoritative for as long as the bot receives them, so the
+        entry does not expire and is only dropped by LRU eviction, a later
+        update or a reload of the subscription chats.
 
-    def decode_data(self, encoded_data: str) -> Union[List[int], range]:
+        Args:
+            user_id (int): The ID of the user.
+            chat_id (int): The ID of the subscription chat.
+            is_member (bool): Whether the user is now a member of the chat.
         """
-        Decodes the given encoded data into a list of IDs or a range of IDs.
+        self.members.set((user_id, chat_id), is_member, ttl=float("inf"))
+
+    async def encode_ranges(
+        self, ranges: List[Tuple[int, int]], created_by: Optional[int] = None
+    ) -> str:
+        """
+        Encodes a set of message ID ranges into the shortest fitting payload.
+
+        A single message or range uses the ID payload, several ranges use
+        the run-length payload, and sets too large for the start parameter
+        are stored in the database and encoded as the ID of the stored link.
+        With LINK_REGISTRY enabled every link is stored.
+
+        Args:
+            ranges (List[Tuple[int, int]]): The first and last IDs of each range,
+                                            ascending and non-overlapping if
+                                            there are several.
+            created_by (Optional[int]): The ID of the admin creating the link.
+
+        Returns:
+            str: The URL-safe base64 encoded payload.
+        """
+        if config.LINK_REGISTRY:
+            return await link_registry.create(ranges, created_by)
+
+        if len(ranges) == 1:
+            start_id, end_id = ranges[0]
+            if start_id == end_id:
+                return url_safe.encode_ids(start_id)
+            return url_safe.encode_ids(start_id, end_id)
+
+        encoded_data = url_safe.encode_ranges(ranges)
+        if len(encoded_data) <= url_safe.MAX_LENGTH:
+            return encoded_data
+
+        return await link_registry.create(ranges, created_by)
+
+    async def decode_data(self, encoded_data: str) -> Optional[Iterable[int]]:
+        """
+        Decodes the given encoded data into the IDs of the messages to send.
+
+        Payloads that are not short URL-safe base64 are rejected before any
+        decoding, and decoded payloads are memoized, so junk costs one regex
+        match and a popular link is decoded once. Links to more than
+        LINK_MAX_MESSAGES messages are rejected.
 
         Args:
             encoded_data (str): The encoded data to decode.
 
         Returns:
-            Union[List[int], range]: A list of IDs or a range of IDs.
+            Optional[Iterable[int]]: The IDs of the messages, or None if the
+                                     payload is invalid.
         """
-        database_chat_id = config.DATABASE_CHAT_ID
-        decoded_data = url_safe.decode_data(encoded_data).split("-")
-        if len(decoded_data) == 2:
-            return [int(int(decoded_data[1]) / abs(database_chat_id))]
+        if not url_safe.PATTERN.fullmatch(encoded_data):
+            return None
 
-        elif len(decoded_data) == 3:
-            start_id = int(int(decoded_data[1]) / abs(database_chat_id))
-            end_id = int(int(decoded_data[2]) / abs(database_chat_id))
-            if start_id < end_id:
-                return range(start_id, end_id + 1)
+        ranges = self.payloads.get(encoded_data)
+        if ranges is None:
+            link_id = url_safe.decode_link(encoded_data)
+            if link_id is not None:
+                # Stored links can change, the registry caches them instead
+                ranges = await link_registry.resolve(link_id)
             else:
-                return range(start_id, end_id - 1, -1)
+                ranges = self.decode_ranges(encoded_data)
+                if self.is_valid_ranges(ranges):
+                    self.payloads.set(encoded_data, ranges)
+
+        if not self.is_valid_ranges(ranges):
+            return None
+
+        return self.iter_ranges(ranges)
+
+    def decode_ranges(self, encoded_data: str) -> Optional[List[Tuple[int, int]]]:
+        """
+        Decodes a payload into the first and last IDs of its ranges.
+
+        Compact payloads start with a version byte: 1 for an ID or a range
+        and 2 for run-length ranges. Legacy payloads are the base64 text
+        "id-<n * abs(DATABASE_CHAT_ID)>" and keep decoding.
+
+        Args:
+            encoded_data (str): The encoded data to decode.
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: The first and last IDs of each
+                                             range, or None if malformed.
+        """
+        data_bytes = url_safe.decode_bytes(encoded_data) or b""
+        version, payload = data_bytes[:1], data_bytes[1:]
+        if version == bytes([url_safe.RANGES_VERSION]):
+            return url_safe.unpack_ranges(payload)
+
+        elif version == bytes([url_safe.VERSION]):
+            message_ids = url_safe.unpack_varints(payload) or []
+        else:
+            message_ids = self.decode_legacy_data(encoded_data)
+
+        if len(message_ids) not in (1, 2):
+            return None
+
+        return [(message_ids[0], message_ids[-1])]
+
+    @classmethod
+    def is_valid_ranges(cls, ranges: Optional[List[Tuple[int, int]]]) -> bool:
+        """
+        Checks that ranges hold valid message IDs and at most LINK_MAX_MESSAGES
+        messages.
+
+        Args:
+            ranges (Optional[List[Tuple[int, int]]]): The first and last IDs of
+                                                      each range.
+
+        Returns:
+            bool: True if the ranges can be delivered.
+        """
+        if not ranges:
+            return False
+
+        total = 0
+        for start_id, end_id in ranges:
+            if not (
+                1 <= start_id <= cls.MAX_MESSAGE_ID
+                and 1 <= end_id <= cls.MAX_MESSAGE_ID
+            ):
+                return False
+            total += abs(end_id - start_id) + 1
+
+        return total <= config.LINK_MAX_MESSAGES
+
+    @staticmethod
+    def parse_ranges(args: List[str]) -> Optional[List[Tuple[int, int]]]:
+        """
+        Parses message IDs and "first-last" ranges of message IDs.
+
+        Args:
+            args (List[str]): The command arguments, e.g. ["10-20", "25"].
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: The first and last IDs of each range,
+                                             or None if an argument is invalid.
+        """
+        ranges = []
+        for arg in args:
+            bounds = arg.split("-")
+            if len(bounds) > 2 or not all(bound.isdigit() for bound in bounds):
+                return None
+
+            start_id, end_id = int(bounds[0]), int(bounds[-1])
+            if not start_id or not end_id:
+                return None
+            ranges.append((start_id, end_id))
+
+        return ranges
+
+    @staticmethod
+    def iter_ranges(ranges: List[Tuple[int, int]]) -> Iterable[int]:
+        """
+        Chains ranges of message IDs into one stream of IDs.
+
+        Args:
+            ranges (List[Tuple[int, int]]): The first and last IDs of each range,
+                                            a descending range is sent in reverse.
+
+        Returns:
+            Iterable[int]: The IDs of every range, in order.
+        """
+        return chain.from_iterable(
+            (
+                range(start_id, end_id + 1)
+                if start_id <= end_id
+                else range(start_id, end_id - 1, -1)
+            )
+            for start_id, end_id in ranges
+        )
+
+    @staticmethod
+    def decode_legacy_data(encoded_data: str) -> List[int]:
+        """
+        Decodes a legacy "id-" payload into its message IDs.
+
+        Args:
+            encoded_data (str): The encoded data to decode.
+
+        Returns:
+            List[int]: The message ID, or the first and last message IDs.
+                       Empty if the payload is malformed.
+        """
+        database_chat_id = abs(config.DATABASE_CHAT_ID)
+        match = url_safe.LEGACY_PATTERN.fullmatch(
+            url_safe.decode_data(encoded_data) or ""
+        )
+        if not match or not database_chat_id:
+            return []
+
+        return [int(value) // database_chat_id for value in match.groups() if value]
 
 
 helper_handlers: HelperHandlers = HelperHandlers(bot)
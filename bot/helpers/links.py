@@ -0,0 +1,109 @@
+from typing import List, Optional, Tuple
+
+from bot.db_funcs import add_link, count_link_hit, get_link, set_link_ranges
+from bot.utils import TTLCache, config
+
+from .url_safe import url_safe
+
+
+class LinkRegistry:
+    """
+    Short-code links whose message ID ranges are stored in the database.
+
+    Lookups are served from a bounded in-memory LRU, so a popular link is
+    read from the database once, and unknown link IDs are remembered for
+    a short while, so random codes do not cost a query on every request.
+    Openings are counted in memory and the hit counters are written in
+    batches.
+
+    Attributes:
+        cache (TTLCache): The ranges of recently used links, keyed by link ID.
+        missing (TTLCache): Recently requested link IDs that do not exist.
+
+    Methods:
+        create(ranges: List[Tuple[int, int]], created_by: Optional[int]) -> str:
+            Stores a link and returns its payload.
+
+        resolve(link_id: int) -> Optional[List[Tuple[int, int]]]:
+            Returns the ranges of a link and counts the opening.
+
+        update(link_id: int, ranges: List[Tuple[int, int]]) -> bool:
+            Points a link to another set of ranges.
+    """
+
+    # Seconds an unknown link ID is answered from memory
+    MISSING_TTL: int = 60
+
+    def __init__(self) -> None:
+        """
+        Initializes the LinkRegistry with an empty cache.
+        """
+        # Links only change through this registry, so entries never expire
+        self.cache = TTLCache(config.LINK_CACHE_SIZE)
+        self.missing = TTLCache(config.LINK_CACHE_SIZE, self.MISSING_TTL)
+
+    async def create(
+        self, ranges: List[Tuple[int, int]], created_by: Optional[int] = None
+    ) -> str:
+        """
+        Stores a link and returns its payload.
+
+        Args:
+            ranges (List[Tuple[int, int]]): The first and last IDs of each range.
+            created_by (Optional[int]): The ID of the admin who created the link.
+
+        Returns:
+            str: The URL-safe base64 encoded payload of the link.
+        """
+        link_id = await add_link(ranges, created_by)
+        self.missing.pop(link_id)
+        self.cache.set(link_id, [tuple(pair) for pair in ranges])
+        return url_safe.encode_link(link_id)
+
+    async def resolve(self, link_id: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Returns the ranges of a link and counts the opening.
+
+        Args:
+            link_id (int): The ID of the link.
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: The first and last IDs of each
+                                             range, or None if not found.
+        """
+        ranges = self.cache.get(link_id)
+        if ranges is None:
+            if self.missing.get(link_id):
+                return None
+
+            link = await get_link(link_id)
+            if not link:
+                self.missing.set(link_id, True)
+                return None
+
+            ranges = [tuple(pair) for pair in link["ranges"]]
+            self.cache.set(link_id, ranges)
+
+        count_link_hit(link_id)
+        return ranges
+
+    async def update(self, link_id: int, ranges: List[Tuple[int, int]]) -> bool:
+        """
+        Points a link to another set of ranges.
+
+        Args:
+            link_id (int): The ID of the link.
+            ranges (List[Tuple[int, int]]): The first and last IDs of each range.
+
+        Returns:
+            bool: True if the link exists.
+        """
+        if not await set_link_ranges(link_id, ranges):
+            return False
+
+        self.missing.pop(link_id)
+        self.cache.set(link_id, list(ranges))
+        return True
+
+
+link_registry: LinkRegistry = LinkRegistry()
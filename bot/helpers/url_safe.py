@@ -1,8 +1,20 @@
 import base64
-from typing import Optional
+import re
+from typing import List, Optional, Tuple
 
 
 class URLSafe:
+    # First byte of compact payloads, legacy payloads start with "i" of "id-"
+    VERSION: int = 1
+    RANGES_VERSION: int = 2
+    LINK_VERSION: int = 3
+    # Telegram's limit for the start parameter
+    MAX_LENGTH: int = 64
+    # Unpadded URL-safe base64 that fits the start parameter
+    PATTERN: re.Pattern = re.compile(r"[A-Za-z0-9_-]{2,64}")
+    # Decoded legacy payload, "id-<first>" or "id-<first>-<last>"
+    LEGACY_PATTERN: re.Pattern = re.compile(r"id-(\d{1,30})(?:-(\d{1,30}))?")
+
     @staticmethod
     def add_padding(data_string: str) -> str:
         """
@@ -60,5 +72,199 @@ class URLSafe:
         except (base64.binascii.Error, UnicodeDecodeError):
             return None
 
+    def encode_bytes(self, data_bytes: bytes) -> str:
+        """
+        Encodes raw bytes into a URL-safe base64 string.
+
+        Args:
+            data_bytes (bytes): The bytes to encode.
+
+        Returns:
+            str: The URL-safe base64 encoded string.
+        """
+        encoded_data = base64.urlsafe_b64encode(data_bytes)
+        return self.del_padding(encoded_data.decode("utf-8"))
+
+    def decode_bytes(self, data_string: str) -> Optional[bytes]:
+        """
+        Decodes a URL-safe base64 string back into raw bytes.
+
+        Args:
+            data_string (str): The URL-safe base64 string to decode.
+
+        Returns:
+            Optional[bytes]: The decoded bytes, or None if decoding fails.
+        """
+        try:
+            return base64.urlsafe_b64decode(self.add_padding(data_string))
+        except (base64.binascii.Error, ValueError):
+            return None
+
+    @staticmethod
+    def pack_varints(values: List[int]) -> bytes:
+        """
+        Packs non-negative integers as LEB128 varints, 7 bits per byte.
+
+        Args:
+            values (List[int]): The integers to pack.
+
+        Returns:
+            bytes: The packed integers.
+        """
+        packed = bytearray()
+        for value in values:
+            while value > 0x7F:
+                packed.append((value & 0x7F) | 0x80)
+                value >>= 7
+            packed.append(value)
+
+        return bytes(packed)
+
+    @staticmethod
+    def unpack_varints(data_bytes: bytes) -> Optional[List[int]]:
+        """
+        Unpacks LEB128 varints.
+
+        Args:
+            data_bytes (bytes): The packed integers.
+
+        Returns:
+            Optional[List[int]]: The integers, or None if the last one is truncated.
+        """
+        values: List[int] = []
+        value, shift = 0, 0
+        for byte in data_bytes:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                values.append(value)
+                value, shift = 0, 0
+
+        return values if not shift else None
+
+    def encode_ids(self, *message_ids: int) -> str:
+        """
+        Encodes a message ID, or the first and last IDs of a range, into a compact payload.
+
+        The payload is a version byte followed by the IDs as varints, e.g. a
+        single message ID takes 4 to 6 characters instead of about 30.
+
+        Args:
+            *message_ids (int): The message ID, or the first and last message IDs.
+
+        Returns:
+            str: The URL-safe base64 encoded payload.
+        """
+        return self.encode_bytes(bytes([self.VERSION]) + self.pack_varints(message_ids))
+
+    @staticmethod
+    def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Sorts ranges and merges the overlapping or adjacent ones.
+
+        Args:
+            ranges (List[Tuple[int, int]]): The first and last IDs of each range,
+                                            in any order.
+
+        Returns:
+            List[Tuple[int, int]]: Ascending, non-overlapping ranges.
+        """
+        merged: List[Tuple[int, int]] = []
+        for start_id, end_id in sorted((min(pair), max(pair)) for pair in ranges):
+            if merged and start_id <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end_id))
+            else:
+                merged.append((start_id, end_id))
+
+        return merged
+
+    def pack_ranges(self, ranges: List[Tuple[int, int]]) -> bytes:
+        """
+        Packs ascending, non-overlapping ranges as run-length varints.
+
+        Each range is stored as its gap from the end of the previous range
+        and its length, so clustered IDs take one or two bytes per range.
+
+        Args:
+            ranges (List[Tuple[int, int]]): The first and last IDs of each range.
+
+        Returns:
+            bytes: The packed ranges.
+        """
+        values, previous_end = [], 0
+        for start_id, end_id in ranges:
+            values += [start_id - previous_end, end_id - start_id]
+            previous_end = end_id
+
+        return self.pack_varints(values)
+
+    def unpack_ranges(self, data_bytes: bytes) -> Optional[List[Tuple[int, int]]]:
+        """
+        Unpacks run-length ranges packed by `pack_ranges`.
+
+        Args:
+            data_bytes (bytes): The packed ranges.
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: The first and last IDs of each
+                                             range, or None if malformed.
+        """
+        values = self.unpack_varints(data_bytes)
+        if not values or len(values) % 2:
+            return None
+
+        ranges, previous_end = [], 0
+        for gap, length in zip(values[::2], values[1::2]):
+            start_id = previous_end + gap
+            previous_end = start_id + length
+            ranges.append((start_id, previous_end))
+
+        return ranges
+
+    def encode_ranges(self, ranges: List[Tuple[int, int]]) -> str:
+        """
+        Encodes a set of message ID ranges into a compact payload.
+
+        Args:
+            ranges (List[Tuple[int, int]]): Ascending, non-overlapping ranges.
+
+        Returns:
+            str: The URL-safe base64 encoded payload.
+        """
+        return self.encode_bytes(
+            bytes([self.RANGES_VERSION]) + self.pack_ranges(ranges)
+        )
+
+    def encode_link(self, link_id: int) -> str:
+        """
+        Encodes the ID of a stored link into a compact payload.
+
+        Args:
+            link_id (int): The ID of the link in the database.
+
+        Returns:
+            str: The URL-safe base64 encoded payload.
+        """
+        return self.encode_bytes(
+            bytes([self.LINK_VERSION]) + self.pack_varints([link_id])
+        )
+
+    def decode_link(self, data_string: str) -> Optional[int]:
+        """
+        Decodes the ID of a stored link from its payload.
+
+        Args:
+            data_string (str): The URL-safe base64 encoded payload.
+
+        Returns:
+            Optional[int]: The ID of the link, or None if it is not a link payload.
+        """
+        data_bytes = self.decode_bytes(data_string) or b""
+        if data_bytes[:1] != bytes([self.LINK_VERSION]):
+            return None
+
+        link_ids = self.unpack_varints(data_bytes[1:]) or []
+        return link_ids[0] if len(link_ids) == 1 else None
+
 
 url_safe: URLSafe = URLSafe()
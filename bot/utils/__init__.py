@@ -1,6 +1,8 @@
+from .cache import TTLCache
 from .config import config
+from .limiter import RateLimiter
 from .logger import logger
 
 BOT_ID = config.BOT_TOKEN.split(":", 1)[0]
 
-__all__ = ["config", "logger", "expired_date", "BOT_ID"]
+__all__ = ["config", "logger", "expired_date", "BOT_ID", "TTLCache", "RateLimiter"]
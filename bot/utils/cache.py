@@ -0,0 +1,121 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    A bounded LRU cache whose entries expire after a time-to-live.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept.
+        ttl (Optional[float]): The default lifetime of an entry in seconds,
+            or None for entries that only leave through eviction.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that found nothing usable.
+
+    Methods:
+        get(key: Hashable) -> Optional[Any]:
+            Returns a cached value, or None if it is missing or expired.
+
+        set(key: Hashable, value: Any, ttl: Optional[float]) -> None:
+            Stores a value, evicting the least recently used entry if full.
+
+        pop(key: Hashable) -> Optional[Any]:
+            Removes an entry and returns its value.
+
+        clear() -> None:
+            Removes every entry.
+
+        stats() -> Dict[str, Any]:
+            Returns the size, hit and miss counters and the hit rate.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        """
+        Initializes the TTLCache with no entries.
+
+        Args:
+            maxsize (int): The maximum number of entries kept.
+            ttl (Optional[float]): The default lifetime of an entry in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Returns the number of entries, including expired ones not yet dropped."""
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns a cached value, or None if it is missing or expired.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            Optional[Any]: The cached value, if any.
+        """
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores a value, evicting the least recently used entry if full.
+
+        Args:
+            key (Hashable): The key of the entry.
+            value (Any): The value to cache.
+            ttl (Optional[float]): The lifetime of this entry in seconds.
+                Defaults to the cache's `ttl`.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """
+        Removes an entry and returns its value.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            Optional[Any]: The removed value, if the entry existed.
+        """
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the size, hit and miss counters and the hit rate.
+
+        Returns:
+            Dict[str, Any]: The cache statistics.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    A token bucket shared by concurrent senders to respect a global rate.
+
+    On a FloodWait the bucket pauses every sender for the requested time and
+    halves its rate, then recovers towards the configured rate while no new
+    FloodWait is reported.
+
+    Attributes:
+        rate (float): The configured number of acquisitions per second.
+        current_rate (float): The rate in effect after adaptive slowdowns.
+        capacity (float): The maximum number of tokens, i.e. the burst size.
+
+    Methods:
+        acquire() -> None:
+            Waits until a token is available and takes it.
+
+        slow_down(seconds: float) -> None:
+            Pauses all senders and halves the rate after a FloodWait.
+    """
+
+    # Fraction of the configured rate regained per second without FloodWait
+    RECOVERY: float = 0.05
+    # Lowest fraction of the configured rate a slowdown can reach
+    MIN_FRACTION: float = 0.1
+
+    def __init__(self, rate: float, capacity: float = 1) -> None:
+        """
+        Initializes the RateLimiter with a full bucket.
+
+        Args:
+            rate (float): The number of acquisitions per second.
+            capacity (float): The maximum burst size. Defaults to 1.
+        """
+        self.rate = rate
+        self.current_rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and takes it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                elapsed = now - self._updated
+                self._updated = now
+                self.current_rate = min(
+                    self.rate, self.current_rate + self.rate * self.RECOVERY * elapsed
+                )
+                self._tokens = min(
+                    self.capacity, self._tokens + elapsed * self.current_rate
+                )
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.current_rate)
+
+    def slow_down(self, seconds: float) -> None:
+        """
+        Pauses all senders and halves the rate after a FloodWait.
+
+        Args:
+            seconds (float): The wait time requested by Telegram.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.current_rate = max(self.rate * self.MIN_FRACTION, self.current_rate / 2)
+        # Neither tokens nor rate are regained while paused
+        self._tokens = 0
+        self._updated = self._paused_until
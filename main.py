@@ -1,4 +1,6 @@
 import asyncio
+import time
+from typing import Any, Awaitable, Dict, List, Set, TypeVar
 
 from hydrogram import errors
 from hydrogram.helpers import ikb
@@ -6,15 +8,21 @@ from hydrogram.helpers import ikb
 from bot import (
     ForceStopLoop,
     bot,
+    broadcast_manager,
     config,
-    del_broadcast_data_id,
-    get_broadcast_data_ids,
+    database,
     helper_buttons,
     helper_handlers,
     initial_database,
+    load_known_users,
     logger,
 )
 
+T = TypeVar("T")
+
+# Background startup work, referenced until done so it is not collected
+deferred_tasks: Set[asyncio.Task] = set()
+
 
 async def chat_db_init() -> None:
     """
@@ -58,70 +66,125 @@ async def send_msg_to_admins(msg_text: str, only_owner: bool = False) -> None:
             continue
 
 
-async def send_restart_msg(chat_id: int, message_id: int, text: str) -> None:
+async def run_step(name: str, step: Awaitable[T]) -> T:
     """
-    Sends a restart message to a specific chat.
+    Awaits a startup step and logs how long it took.
 
     Args:
-        chat_id (int): The ID of the chat to send the message to.
-        message_id (int): The ID of the message to reply to.
-        text (str): The message text to send.
+        name (str): The name of the step used in log messages.
+        step (Awaitable[T]): The step to run.
+
+    Returns:
+        T: The result of the step.
     """
-    await bot.send_message(chat_id, text, reply_to_message_id=message_id)
+    started = time.perf_counter()
+    result = await step
+    logger.info(f"Startup {name}: {time.perf_counter() - started:.2f}s")
+    return result
 
 
-async def cache_db_init() -> None:
+async def database_init() -> None:
     """
-    Initializes various cache-related handlers.
+    Connects to the database before the bot starts handling updates.
     """
-    await asyncio.gather(
-        helper_handlers.force_text_init(),
-        helper_handlers.start_text_init(),
-        helper_handlers.generate_status_init(),
-        helper_handlers.protect_content_init(),
-        helper_handlers.admins_init(),
-        helper_handlers.fs_chats_init(),
-    )
+    logger.info(f"{database.name}: Connecting...")
+    await database.connect()
 
 
-async def restart_data_init() -> None:
+async def restart_data_init() -> List[Dict[str, Any]]:
     """
-    Handles the initialization process when the bot restarts, including sending messages and handling broadcast data.
+    Resumes the broadcast jobs that were queued or running when the bot stopped.
+
+    Returns:
+        List[Dict[str, Any]]: The loaded broadcast jobs.
     """
     try:
-        chat_id, message_id = await get_broadcast_data_ids()
-        logger.info(f"BroadcastID: {chat_id}, {message_id}")
+        jobs = await broadcast_manager.load_jobs()
+        job_ids = ", ".join(str(job["_id"]) for job in jobs) or None
+        logger.info(f"Broadcast Jobs: {job_ids}")
+        return jobs
+    except Exception as exc:
+        logger.error(str(exc))
+        return []
 
-        if chat_id and message_id:
-            await send_restart_msg(chat_id, message_id, "<b>An Error Occurred!</b>")
-            await del_broadcast_data_id()
 
-        task_msg = (
-            "<u><b>Bot Up and Running!</b></u>\n\n"
-            "  <b>Broadcast Status</b>\n"
-            f"    - <code>Chat ID:</code> {chat_id}\n"
-            f"    - <code>Msg ID :</code> {message_id}"
-        )
-        await send_msg_to_admins(task_msg, only_owner=True)
+async def send_restart_msg(jobs: List[Dict[str, Any]]) -> None:
+    """
+    Notifies the owner that the bot is up, with the queued broadcast jobs.
+
+    Args:
+        jobs (List[Dict[str, Any]]): The loaded broadcast jobs.
+    """
+    job_ids = ", ".join(str(job["_id"]) for job in jobs) or None
+    task_msg = (
+        "<u><b>Bot Up and Running!</b></u>\n\n"
+        "  <b>Broadcast Status</b>\n"
+        f"    - <code>Queued :</code> {len(jobs)}\n"
+        f"    - <code>Job IDs:</code> {job_ids}"
+    )
+    await send_msg_to_admins(task_msg, only_owner=True)
 
-    except Exception as exc:
-        logger.error(str(exc))
+
+def run_deferred(step: Awaitable[Any]) -> None:
+    """
+    Runs non-critical work in the background once the bot is up.
+
+    Args:
+        step (Awaitable[Any]): The work to run.
+    """
+    task = asyncio.ensure_future(step)
+    deferred_tasks.add(task)
+    task.add_done_callback(deferred_done)
+
+
+def deferred_done(task: asyncio.Task) -> None:
+    """
+    Releases a finished background task and logs its error, if any.
+
+    Args:
+        task (asyncio.Task): The finished task.
+    """
+    deferred_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Startup: {task.exception()}")
 
 
 async def main() -> None:
     """
     Main function to initialize and run the bot, including database setup, cache initialization,
     and restart handling.
+
+    Independent steps run concurrently: the database migrations run while
+    the bot logs in, and the settings are loaded while the database chat
+    is checked. Updates are only handled once the settings are loaded.
+    Loading the known users, command registration and the owner
+    notification run after startup.
     """
-    await bot.start()
+    started = time.perf_counter()
+
+    # Buffered writes and handlers need the database, so connect first
+    await run_step("Database", database_init())
+    await asyncio.gather(
+        run_step("Bot", bot.start()),
+        run_step("Defaults", initial_database()),
+    )
     bot_user_id, bot_username = bot.me.id, bot.me.username
 
-    await initial_database()
-    await chat_db_init()
-    await cache_db_init()
-    await restart_data_init()
+    await asyncio.gather(
+        run_step("ChatDB", chat_db_init()),
+        run_step("Settings", helper_handlers.settings_init()),
+    )
+    # Broadcasts exclude the admins, so the settings must be loaded
+    jobs = await run_step("Broadcasts", restart_data_init())
+    await run_step("Updates", bot.serve())
 
     logger.info(f"@{bot_username} {bot_user_id}")
+    logger.info(f"Startup: {time.perf_counter() - started:.2f}s")
+
+    # New users are buffered before the known users are loaded
+    run_deferred(load_known_users())
+    run_deferred(bot.bot_commands_setup())
+    run_deferred(send_restart_msg(jobs))
 
 
 if __name__ == "__main__":
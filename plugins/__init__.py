@@ -2,9 +2,12 @@ list_available_commands = [
     "batch",
     "broadcast",
     "bc",
+    "cache",
+    "links",
     "log",
     "ping",
     "privacy",
+    "queue",
     "start",
     "stop",
     "users",
@@ -1,8 +1,17 @@
+from typing import List, Tuple
+
 from hydrogram import Client, errors, filters
 from hydrogram.helpers import ikb
 from hydrogram.types import Message
 
-from bot import authorized_users_only, config, logger, url_safe
+from bot import (
+    authorized_users_only,
+    config,
+    helper_handlers,
+    logger,
+    message_delivery,
+    url_safe,
+)
 
 
 @Client.on_message(filters.private & filters.command("batch"))
@@ -10,6 +19,18 @@ from bot import authorized_users_only, config, logger, url_safe
 async def batch_handler(client: Client, message: Message) -> None:
     database_chat_id = config.DATABASE_CHAT_ID
 
+    # "/batch 10-20 25 30-32" links a sparse set of messages in one link
+    if len(message.command) > 1:
+        ranges = helper_handlers.parse_ranges(message.command[1:])
+        if not ranges:
+            await message.reply_text(
+                "<b>Usage:</b>\n  <code>/batch 10-20 25 30-32</code>", quote=True
+            )
+            return
+
+        await reply_batch_url(client, message, url_safe.merge_ranges(ranges))
+        return
+
     async def ask_for_message_id(ask_msg: str) -> int:
         """
         Ask the user to forward a message from the Database Channel and return the message ID.
@@ -58,11 +79,31 @@ async def batch_handler(client: Client, message: Message) -> None:
     if last_message_id is None:
         return
 
-    # Encode data
+    await reply_batch_url(client, message, [(first_message_id, last_message_id)])
+
+
+async def reply_batch_url(
+    client: Client, message: Message, ranges: List[Tuple[int, int]]
+) -> None:
+    """
+    Replies with a link to a set of message ID ranges and indexes the messages.
+
+    Args:
+        client (Client): The bot client.
+        message (Message): The admin's /batch command.
+        ranges (List[Tuple[int, int]]): The first and last IDs of each range.
+    """
+    # Links over the limit would be rejected when opened
+    if not helper_handlers.is_valid_ranges(ranges):
+        await message.reply_text(
+            f"<b>Too Many Messages!</b> The limit is {config.LINK_MAX_MESSAGES}.",
+            quote=True,
+        )
+        return
+
     try:
-        first_id = first_message_id * abs(database_chat_id)
-        last_id = last_message_id * abs(database_chat_id)
-        encoded_data = url_safe.encode_data(f"id-{first_id}-{last_id}")
+        # Encode data
+        encoded_data = await helper_handlers.encode_ranges(ranges, message.from_user.id)
         encoded_data_url = f"https://t.me/{client.me.username}?start={encoded_data}"
         share_encoded_data_url = f"https://t.me/share?url={encoded_data_url}"
 
@@ -73,6 +114,9 @@ async def batch_handler(client: Client, message: Message) -> None:
             reply_markup=ikb([[("Share", share_encoded_data_url, "url")]]),
             disable_web_page_preview=True,
         )
+
+        # Index the stored messages after replying, so the link is not delayed
+        await message_delivery.index_messages(helper_handlers.iter_ranges(ranges))
     except Exception as exc:
         logger.error(f"Batch: {exc}")
         await message.reply_text("<b>An Error Occurred!</b>", quote=True)
@@ -1,134 +1,77 @@
-import asyncio
+from typing import Optional
 
-from hydrogram import Client, errors, filters
+from hydrogram import Client, filters
 from hydrogram.helpers import ikb
 from hydrogram.types import CallbackQuery, Message
 
-from bot import (
-    add_broadcast_data_id,
-    authorized_users_only,
-    del_broadcast_data_id,
-    del_user,
-    get_users,
-    helper_buttons,
-    helper_handlers,
-    logger,
-)
-
-
-class BroadcastManager:
-    def __init__(self):
-        self.is_running = False
-        self.sent = 0
-        self.failed = 0
-        self.total = 0
-
-    async def start_broadcast(
-        self, client: Client, message: Message, broadcast_msg: Message
-    ) -> None:
-        if self.is_running:
-            await message.reply_text(
-                "<b>Currently, a broadcast is running. Check the status for details.</b>",
-                quote=True,
-            )
-            return
-
-        progress_msg = await message.reply_text(
-            "<b>Broadcasting...</b>",
-            quote=True,
-            reply_markup=ikb(helper_buttons.Broadcast),
-        )
-
-        users, admins = await get_users(), helper_handlers.admins
-        user_ids = [user for user in users if user not in admins]
-
-        self.is_running, self.total = True, len(user_ids)
-        logger.info("Broadcast: Starting...")
-
-        chat_id, message_id = message.chat.id, progress_msg.id
-        await add_broadcast_data_id(chat_id, message_id)
-
-        for user_id in user_ids:
-            if not self.is_running:
-                break
-
-            try:
-                await broadcast_msg.copy(
-                    user_id, protect_content=helper_handlers.protect_content
-                )
-                self.sent += 1
-            except errors.FloodWait as fw:
-                logger.warning(f"FloodWait: Sleep {fw.value}")
-                await asyncio.sleep(fw.value)
-            except errors.RPCError:
-                await del_user(user_id)
-                self.failed += 1
-
-            if (self.sent + self.failed) % 250 == 0:
-                await self.update_progress(progress_msg)
-
-        await self.finalize_broadcast(message, progress_msg)
-
-    async def update_progress(self, message: Message) -> None:
-        await message.edit_text(
-            "<b>Broadcast Status</b>:\n"
-            f"  - <code>Sent  :</code> {self.sent} - {self.total}\n"
-            f"  - <code>Failed:</code> {self.failed}",
-            reply_markup=ikb(helper_buttons.Broadcast),
-        )
-
-    async def finalize_broadcast(self, message: Message, progress_msg: Message) -> None:
-        status_msg = (
-            "Broadcast Finished"
-            if self.sent + self.failed == self.total
-            else "Broadcast Stopped"
-        )
-
-        await message.reply_text(
-            f"<b>{status_msg}</b>\n"
-            f"  - <code>Sent  :</code> {self.sent} - {self.total}\n"
-            f"  - <code>Failed:</code> {self.failed}",
-            quote=True,
-            reply_markup=ikb(helper_buttons.Close),
-        )
+from bot import authorized_users_only, broadcast_manager, helper_buttons
 
-        logger.info(status_msg)
-        await del_broadcast_data_id()
-        await progress_msg.delete()
-
-        self.is_running, self.sent, self.failed, self.total = False, 0, 0, 0
-
-
-broadcast_manager = BroadcastManager()
+DELAY_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
 
 
 @Client.on_message(filters.command(["broadcast", "bc"]))
 @authorized_users_only
-async def broadcast_handler(client: Client, message: Message) -> None:
+async def broadcast_handler(_, message: Message) -> None:
     broadcast_msg = message.reply_to_message
 
     if not broadcast_msg:
         if not broadcast_manager.is_running:
             await message.reply_text(
-                "<b>Please reply to the message you want to broadcast!</b>",
+                "<b>Please reply to the message you want to broadcast!</b>\n"
+                "  - <code>/broadcast [delay] [priority]</code>, e.g. "
+                "<code>/broadcast 2h 1</code>",
                 quote=True,
             )
         else:
             await message.reply_text(
-                "<b>Broadcast Status</b>:\n"
-                f"  - <code>Sent  :</code> {broadcast_manager.sent} - {broadcast_manager.total}\n"
-                f"  - <code>Failed:</code> {broadcast_manager.failed}",
+                broadcast_manager.status_text(),
                 quote=True,
                 reply_markup=ikb(helper_buttons.Broadcast),
             )
         return
 
-    await broadcast_manager.start_broadcast(client, message, broadcast_msg)
+    delay = parse_delay(message.command[1]) if len(message.command) > 1 else 0
+    priority = message.command[2] if len(message.command) > 2 else "0"
+    if delay is None or not priority.lstrip("-").isdigit():
+        await message.reply_text(
+            "<b>Invalid delay or priority!</b>\n"
+            "  - <code>/broadcast [delay] [priority]</code>, e.g. "
+            "<code>/broadcast 2h 1</code>",
+            quote=True,
+        )
+        return
+
+    starts_now = not delay and not broadcast_manager.is_running
+    job = await broadcast_manager.add_job(message, broadcast_msg, delay, int(priority))
+
+    # The scheduler replies with the progress message once the job starts
+    if not starts_now:
+        await message.reply_text(
+            f"<b>Broadcast Queued</b>: ID {job['_id']}\n\n"
+            + broadcast_manager.queue_text(),
+            quote=True,
+        )
+
+
+@Client.on_message(filters.command("queue"))
+@authorized_users_only
+async def queue_handler(_, message: Message) -> None:
+    await message.reply_text(broadcast_manager.queue_text(), quote=True)
 
 
 @Client.on_message(filters.command("stop"))
 @authorized_users_only
 async def stop_broadcast_handler(_, message: Message) -> None:
+    if len(message.command) > 1:
+        job_id = message.command[1]
+        if job_id.isdigit() and await broadcast_manager.cancel_job(int(job_id)):
+            await message.reply_text(
+                f"<b>Broadcast {job_id} has been cancelled!</b>", quote=True
+            )
+        else:
+            await message.reply_text("<b>No such broadcast!</b>", quote=True)
+        return
+
     if not broadcast_manager.is_running:
         await message.reply_text(
             "<b>No broadcast is currently running!</b>", quote=True
@@ -143,3 +86,9 @@ async def stop_broadcast_handler(_, message: Message) -> None:
 async def broadcast_handler_query(_, query: CallbackQuery) -> None:
     await query.message.edit_text("<b>Refreshing...</b>")
     await broadcast_manager.update_progress(query.message)
+
+
+def parse_delay(text: str) -> Optional[int]:
+    text = text.lower()
+    value = text[:-1] if text[-1] in DELAY_UNITS else text
+    return int(value) * DELAY_UNITS.get(text[-1], 1) if value.isdigit() else None
@@ -0,0 +1,16 @@
+from typing import List
+
+from hydrogram import Client, filters
+from hydrogram.types import Message
+
+from bot import config, message_delivery
+
+
+@Client.on_edited_message(filters.chat(config.DATABASE_CHAT_ID))
+async def edited_handler(_, message: Message) -> None:
+    await message_delivery.index_message(message)
+
+
+@Client.on_deleted_messages(filters.chat(config.DATABASE_CHAT_ID))
+async def deleted_handler(_, messages: List[Message]) -> None:
+    await message_delivery.forget([message.id for message in messages])
@@ -0,0 +1,35 @@
+from hydrogram import Client, enums, filters
+from hydrogram.types import ChatMember, ChatMemberUpdated
+
+from bot import helper_handlers
+
+MEMBER_STATUSES = [
+    enums.ChatMemberStatus.OWNER,
+    enums.ChatMemberStatus.ADMINISTRATOR,
+    enums.ChatMemberStatus.MEMBER,
+]
+
+
+async def fs_chats_filter(_, __, update: ChatMemberUpdated) -> bool:
+    return update.chat.id in helper_handlers.fs_chats
+
+
+@Client.on_chat_member_updated(filters.create(fs_chats_filter))
+async def fs_member_handler(_, update: ChatMemberUpdated) -> None:
+    member = update.new_chat_member or update.old_chat_member
+    if not member or not member.user:
+        return
+
+    helper_handlers.track_member(
+        member.user.id, update.chat.id, is_member(update.new_chat_member)
+    )
+
+
+def is_member(member: ChatMember) -> bool:
+    if not member:
+        return False
+
+    if member.status == enums.ChatMemberStatus.RESTRICTED:
+        return bool(member.is_member)
+
+    return member.status in MEMBER_STATUSES
@@ -2,7 +2,7 @@ from hydrogram import Client, filters
 from hydrogram.helpers import ikb
 from hydrogram.types import Message
 
-from bot import authorized_users_only, config, helper_handlers, logger, url_safe
+from bot import authorized_users_only, config, helper_handlers, logger, message_delivery
 from plugins import list_available_commands
 
 
@@ -21,8 +21,8 @@ async def generate_handler(client: Client, message: Message) -> None:
         message_db = await message.copy(database_chat_id)
 
         # Encode message ID
-        encoded_data = url_safe.encode_data(
-            f"id-{message_db.id * abs(database_chat_id)}"
+        encoded_data = await helper_handlers.encode_ranges(
+            [(message_db.id, message_db.id)], message.from_user.id
         )
         encoded_data_url = f"https://t.me/{client.me.username}?start={encoded_data}"
 
@@ -36,6 +36,9 @@ async def generate_handler(client: Client, message: Message) -> None:
             reply_markup=ikb([[("Share", share_encoded_data_url, "url")]]),
             disable_web_page_preview=True,
         )
+
+        # Record the stored message so delivery can skip the database chat
+        await message_delivery.index_message(message_db)
     except Exception as exc:
         # Log the error and inform the user
         logger.error(f"Generator: {exc}")
@@ -0,0 +1,76 @@
+import datetime
+from typing import Any, Dict, List, Tuple
+
+from hydrogram import Client, filters
+from hydrogram.types import Message
+
+from bot import (
+    authorized_users_only,
+    config,
+    get_links,
+    helper_handlers,
+    link_registry,
+    logger,
+    url_safe,
+)
+
+
+@Client.on_message(filters.private & filters.command("links"))
+@authorized_users_only
+async def links_handler(client: Client, message: Message) -> None:
+    # "/links <code> 10-20 25" points a stored link to other messages
+    if len(message.command) > 1:
+        link_id = url_safe.decode_link(message.command[1])
+        ranges = helper_handlers.parse_ranges(message.command[2:])
+        if link_id is None or not ranges:
+            await message.reply_text(
+                "<b>Usage:</b>\n  <code>/links [code] [10-20 25 ...]</code>", quote=True
+            )
+            return
+
+        ranges = url_safe.merge_ranges(ranges) if len(ranges) > 1 else ranges
+        if not helper_handlers.is_valid_ranges(ranges):
+            await message.reply_text(
+                f"<b>Too Many Messages!</b> The limit is {config.LINK_MAX_MESSAGES}.",
+                quote=True,
+            )
+            return
+
+        if await link_registry.update(link_id, ranges):
+            await message.reply_text(
+                f"<b>Link Updated:</b> {format_ranges(ranges)}", quote=True
+            )
+        else:
+            await message.reply_text("<b>Link Not Found!</b>", quote=True)
+        return
+
+    try:
+        links = await get_links()
+        if not links:
+            await message.reply_text("<b>No Stored Links!</b>", quote=True)
+            return
+
+        msg_links = "<b>Recent Links:</b>\n" + "".join(
+            format_link(link) for link in links
+        )
+        await message.reply_text(msg_links, quote=True, disable_web_page_preview=True)
+    except Exception as exc:
+        logger.error(f"Links: {exc}")
+        await message.reply_text("<b>An Error Occurred!</b>", quote=True)
+
+
+def format_link(link: Dict[str, Any]) -> str:
+    encoded_data = url_safe.encode_link(link["_id"])
+    created_at = datetime.datetime.fromtimestamp(link.get("created_at", 0))
+    return (
+        f"  - <code>{encoded_data}</code> "
+        f"({created_at.strftime('%b %d, %Y')}, {link.get('hits', 0)} Hits)\n"
+        f"    {format_ranges(link['ranges'])}\n"
+    )
+
+
+def format_ranges(ranges: List[Tuple[int, int]]) -> str:
+    return ", ".join(
+        str(start_id) if start_id == end_id else f"{start_id}-{end_id}"
+        for start_id, end_id in ranges
+    )
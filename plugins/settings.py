@@ -87,15 +87,13 @@ async def change_handler_query(_, query: CallbackQuery) -> None:
     query_data = query.data.split()[1]
 
     if query_data == "generate":
-        await update_generate_status()
-        await helper_handlers.generate_status_init()
+        helper_handlers.generate_status = await update_generate_status()
         logger.info("Generate Status: Changed")
         text = f"Generate Status has been changed to <b>{helper_handlers.generate_status}</b>"
         buttons = helper_buttons.Generate_
 
     elif query_data == "protect":
-        await update_protect_content()
-        await helper_handlers.protect_content_init()
+        helper_handlers.protect_content = await update_protect_content()
         logger.info("Protect Content: Changed")
         text = f"Protect Content has been changed to <b>{helper_handlers.protect_content}</b>"
         buttons = helper_buttons.Protect_
@@ -144,12 +142,10 @@ async def set_handler_query(client: Client, query: CallbackQuery) -> None:
         )
     else:
         if query_data == "start":
-            await update_start_text_msg(new_text)
-            await helper_handlers.start_text_init()
+            helper_handlers.start_text = await update_start_text_msg(new_text)
             logger.info("Start Text: Customized")
         else:
-            await update_force_text_msg(new_text)
-            await helper_handlers.force_text_init()
+            helper_handlers.force_text = await update_force_text_msg(new_text)
             logger.info("Force Text: Customized")
 
         await query.message.edit_text(
@@ -5,10 +5,10 @@ from hydrogram.types import Message, User
 from bot import (
     add_user,
     admin_buttons,
-    config,
     helper_buttons,
     helper_handlers,
     join_buttons,
+    message_delivery,
 )
 
 
@@ -18,24 +18,26 @@ async def start_handler(client: Client, message: Message) -> None:
     await add_user(user.id)
 
     start_text = format_text_message(helper_handlers.start_text, user)
-    user_buttons = await join_buttons(client, message, user.id)
+    # Checked once per update, the buttons and the gate share the result
+    no_join_ids = await helper_handlers.user_is_not_join(user.id)
+    user_buttons = await join_buttons(client, message, user.id, no_join_ids or [])
     if len(message.command) == 1:
         buttons = admin_buttons() if user.id in helper_handlers.admins else user_buttons
         await message.reply_text(start_text, quote=True, reply_markup=buttons)
     else:
         force_text = format_text_message(helper_handlers.force_text, user)
-        if await helper_handlers.user_is_not_join(user.id):
+        if no_join_ids:
             await message.reply_text(force_text, quote=True, reply_markup=user_buttons)
             return
 
+        message_ids = await helper_handlers.decode_data(message.command[1])
+        if message_ids is None:
+            return
+
         try:
-            message_ids = helper_handlers.decode_data(message.command[1])
-            msgs = await client.get_messages(config.DATABASE_CHAT_ID, message_ids)
-            for msg in msgs:
-                if not msg.empty:
-                    await msg.copy(
-                        user.id, protect_content=helper_handlers.protect_content
-                    )
+            await message_delivery.send_messages(
+                user.id, message_ids, helper_handlers.protect_content
+            )
         except errors.RPCError:
             pass
 
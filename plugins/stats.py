@@ -5,12 +5,15 @@ from hydrogram.helpers import ikb
 from hydrogram.types import CallbackQuery, Message
 
 from bot import (
+    TTLCache,
     authorized_users_only,
     config,
-    get_users,
+    count_users,
     helper_buttons,
     helper_handlers,
+    link_registry,
     logger,
+    message_delivery,
 )
 
 startup_date = datetime.datetime.now()
@@ -29,14 +32,13 @@ async def users_handler(_, message: Message) -> None:
     counting_message = await message.reply_text("<b>Counting...</b>", quote=True)
 
     try:
-        all_users = await get_users()
-        bot_users = [user for user in all_users if user not in helper_handlers.admins]
+        all_users, bot_users = await count_users(exclude=helper_handlers.admins)
 
         msg_users = (
             "<b>Bot Users:</b>\n"
-            f"  - <code>Users :</code> {len(bot_users)}\n"
+            f"  - <code>Users :</code> {bot_users}\n"
             f"  - <code>Admins:</code> {len(helper_handlers.admins)}\n\n"
-            f"<b>Total:</b> {len(all_users)} Users"
+            f"<b>Total:</b> {all_users} Users"
         )
         await counting_message.edit_text(msg_users)
     except Exception as exc:
@@ -44,6 +46,29 @@ async def users_handler(_, message: Message) -> None:
         await counting_message.edit_text("<b>An Error Occurred!</b>")
 
 
+@Client.on_message(filters.private & filters.command("cache"))
+@authorized_users_only
+async def cache_handler(_, message: Message) -> None:
+    caches = {
+        "Messages": message_delivery.cache,
+        "Members": helper_handlers.members,
+        "Links": link_registry.cache,
+    }
+
+    msg_cache = "<b>Cache Stats:</b>\n" + "".join(
+        format_cache_stats(name, cache) for name, cache in caches.items()
+    )
+    await message.reply_text(msg_cache, quote=True)
+
+
+def format_cache_stats(name: str, cache: TTLCache) -> str:
+    stats = cache.stats()
+    return (
+        f"  - <code>{name}:</code> {stats['hits']} Hits, {stats['misses']} Misses "
+        f"({stats['hit_rate']:.1%}), {stats['size']}/{cache.maxsize} Cached\n"
+    )
+
+
 @Client.on_message(filters.private & filters.command("uptime"))
 async def uptime_handler(_, message: Message) -> None:
     uptime_text = uptime_func()